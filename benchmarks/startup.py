@@ -0,0 +1,77 @@
+"""冷启动基准：导入耗时与应用启动耗时。
+
+在仓库根目录运行::
+
+    python benchmarks/startup.py [--runs 10]
+
+每项导入在独立的子进程中测量（模块缓存为空），取多次运行的中位数；
+启动耗时分别测量全新数据库（需要建表）与已有数据库（结构版本一致、跳过建表）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORTS = {
+    "import chat_hub_protocol": "import chat_hub_protocol",
+    "from chat_hub_protocol import ChatPayload": "from chat_hub_protocol import ChatPayload",
+    "import src.api": "import src.api",
+}
+
+_TIMED = "import time; _t = time.perf_counter(); {stmt}; print(time.perf_counter() - _t)"
+
+_STARTUP = """
+import time
+from src.models import settings
+from src.storage import create_backend
+_t = time.perf_counter()
+create_backend(settings).close()
+print(time.perf_counter() - _t)
+"""
+
+
+def _measure(code: str, runs: int, env: dict[str, str] | None = None) -> float:
+    """在子进程中运行 code 多次，返回其输出耗时的中位数（秒）。"""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="每项测量的运行次数")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for label, stmt in IMPORTS.items():
+        results[label] = _measure(_TIMED.format(stmt=stmt), args.runs)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {**os.environ, "CHAT_HUB_DATA_DIR": data_dir, "CHAT_HUB_STORAGE_BACKEND": "sqlite"}
+        db_path = Path(data_dir, "chat_hub.db")
+        cold = []
+        for _ in range(args.runs):
+            db_path.unlink(missing_ok=True)
+            cold.append(_measure(_STARTUP, 1, env))
+        results["启动（新数据库，建表）"] = statistics.median(cold)
+        results["启动（已有数据库，跳过建表）"] = _measure(_STARTUP, args.runs, env)
+
+    width = max(len(label) for label in results)
+    for label, seconds in results.items():
+        print(f"{label:<{width}}  {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,71 @@
 """chat-hub-protocol — Chat Hub 通信协议。
 
 独立发布的轻量包，定义客户端与服务端的公共数据结构。
+
+导出的名称在首次访问时才导入对应子模块，`import chat_hub_protocol`
+本身不会加载 pydantic 等依赖。
 """
 
-from .chat import ChatEvent, ChatPayload, EventType, Message, Role
-from .client import chat, chat_segments, clear_context, clear_memory
-from .command import (
-    ClearContextCommand,
-    ClearMemoryCommand,
-    Command,
-    CommandPayload,
-    CommandResult,
-)
-from .message import (
-    AudioSegment,
-    FileSegment,
-    ImageSegment,
-    Segment,
-    TextSegment,
-    VideoSegment,
-)
+from __future__ import annotations
+
+import importlib
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chat import ChatEvent, ChatPayload, EventType, Message, Role
+    from .client import chat, chat_segments, clear_context, clear_memory, list_sessions, session_stats
+    from .command import (
+        ClearContextCommand,
+        ClearMemoryCommand,
+        Command,
+        CommandPayload,
+        CommandResult,
+        ListSessionsCommand,
+        SessionInfo,
+        SessionStatsCommand,
+    )
+    from .message import (
+        AudioSegment,
+        FileSegment,
+        ImageSegment,
+        Segment,
+        TextSegment,
+        VideoSegment,
+    )
+
+_EXPORTS = {
+    # chat
+    "ChatEvent": "chat",
+    "ChatPayload": "chat",
+    "EventType": "chat",
+    "Message": "chat",
+    "Role": "chat",
+    # client helpers
+    "chat": "client",
+    "chat_segments": "client",
+    "clear_context": "client",
+    "clear_memory": "client",
+    "list_sessions": "client",
+    "session_stats": "client",
+    # commands
+    "ClearContextCommand": "command",
+    "ClearMemoryCommand": "command",
+    "Command": "command",
+    "CommandPayload": "command",
+    "CommandResult": "command",
+    "ListSessionsCommand": "command",
+    "SessionInfo": "command",
+    "SessionStatsCommand": "command",
+    # message segments
+    "AudioSegment": "message",
+    "FileSegment": "message",
+    "ImageSegment": "message",
+    "Segment": "message",
+    "TextSegment": "message",
+    "VideoSegment": "message",
+}
 
 __all__ = [
     # chat
@@ -33,12 +79,17 @@ __all__ = [
     "chat_segments",
     "clear_context",
     "clear_memory",
+    "list_sessions",
+    "session_stats",
     # commands
     "ClearContextCommand",
     "ClearMemoryCommand",
     "Command",
     "CommandPayload",
     "CommandResult",
+    "ListSessionsCommand",
+    "SessionInfo",
+    "SessionStatsCommand",
     # message segments
     "AudioSegment",
     "FileSegment",
@@ -47,3 +98,29 @@ __all__ = [
     "TextSegment",
     "VideoSegment",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
+
+
+class _ProtocolModule(ModuleType):
+    """子模块 `chat` 首次导入时，导入系统会把它设为包属性；
+    这里保留 `chat_hub_protocol.chat` 指向同名的客户端函数 `client.chat`。"""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "chat" and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ProtocolModule
@@ -6,11 +6,15 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from .chat import ChatPayload, Message, Role
 from .command import (
     ClearContextCommand,
     ClearMemoryCommand,
     CommandPayload,
+    ListSessionsCommand,
+    SessionStatsCommand,
 )
 from .message import (
     AudioSegment,
@@ -26,6 +30,8 @@ __all__ = [
     "chat_segments",
     "clear_context",
     "clear_memory",
+    "list_sessions",
+    "session_stats",
 ]
 
 
@@ -134,3 +140,47 @@ def clear_memory(bot_id: str, session_id: str) -> CommandPayload:
         session_id=session_id,
         command=ClearMemoryCommand(),
     )
+
+
+def list_sessions(
+    bot_id: str,
+    *,
+    offset: int = 0,
+    limit: int = 20,
+    order: Literal["last_active", "first_active", "message_count", "total_bytes"] = "last_active",
+    descending: bool = True,
+) -> CommandPayload:
+    """构建"列出会话"命令载荷。
+
+    Args:
+        bot_id: Bot 唯一标识。
+        offset: 跳过的会话数。
+        limit: 返回的最大会话数（1~200）。
+        order: 排序字段：``last_active`` / ``first_active`` / ``message_count`` / ``total_bytes``。
+        descending: 是否降序，默认最近活跃的在前。
+
+    Returns:
+        可直接序列化的 CommandPayload。
+    """
+    return CommandPayload(
+        bot_id=bot_id,
+        session_id="",
+        command=ListSessionsCommand(offset=offset, limit=limit, order=order, descending=descending),
+    )
+
+
+def session_stats(bot_id: str, session_id: str) -> CommandPayload:
+    """构建"查询会话统计"命令载荷。
+
+    Args:
+        bot_id: Bot 唯一标识。
+        session_id: 会话唯一标识。
+
+    Returns:
+        可直接序列化的 CommandPayload。
+    """
+    return CommandPayload(
+        bot_id=bot_id,
+        session_id=session_id,
+        command=SessionStatsCommand(),
+    )
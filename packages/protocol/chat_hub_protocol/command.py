@@ -1,17 +1,17 @@
 """命令协议定义。
 
-定义客户端向服务端发送的控制命令，如清除上下文、清除记忆、设置参数等。
+定义客户端向服务端发送的控制命令，如清除上下文、清除记忆、查询会话等。
 使用 discriminated union 实现类型安全的多态序列化/反序列化。
 """
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Annotated, Any, Literal, Union
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
-
 # ── 具体命令 ──────────────────────────────────────────────
 
 
@@ -27,10 +27,36 @@ class ClearMemoryCommand(BaseModel):
     type: Literal["clear_memory"] = "clear_memory"
 
 
+class ListSessionsCommand(BaseModel):
+    """分页列出该 bot 的所有会话（忽略载荷中的 session_id）。
+
+    结果在 `CommandResult.data` 中：``{"sessions": [SessionInfo, ...], "total": int}``。
+    """
+
+    type: Literal["list_sessions"] = "list_sessions"
+    offset: int = Field(0, ge=0)
+    """跳过的会话数。"""
+    limit: int = Field(20, ge=1, le=200)
+    """返回的最大会话数。"""
+    order: Literal["last_active", "first_active", "message_count", "total_bytes"] = "last_active"
+    """排序字段。"""
+    descending: bool = True
+    """是否降序。"""
+
+
+class SessionStatsCommand(BaseModel):
+    """查询当前会话的统计信息。
+
+    结果在 `CommandResult.data` 中：``{"session": SessionInfo | None}``，会话无消息时为 None。
+    """
+
+    type: Literal["session_stats"] = "session_stats"
+
+
 # ── 联合类型 ──────────────────────────────────────────────
 
 Command = Annotated[
-    Union[ClearContextCommand, ClearMemoryCommand],
+    Union[ClearContextCommand, ClearMemoryCommand, ListSessionsCommand, SessionStatsCommand],
     Field(discriminator="type"),
 ]
 """命令联合类型，通过 `type` 字段自动区分具体命令。"""
@@ -52,6 +78,25 @@ class CommandPayload(BaseModel):
     """请求唯一标识，用于链路追踪。"""
 
 
+class SessionInfo(BaseModel):
+    """会话统计信息。"""
+
+    session_id: str
+    """会话唯一标识。"""
+    message_count: int
+    """消息条数。"""
+    total_bytes: int
+    """消息内容（JSON 序列化后，UTF-8）的总字节数。"""
+    first_pk: int
+    """第一条消息的主键。"""
+    last_pk: int
+    """最后一条消息的主键。"""
+    first_at: datetime
+    """第一条消息的时间。"""
+    last_at: datetime
+    """最后一条消息的时间（最近活跃时间）。"""
+
+
 class CommandResult(BaseModel):
     """命令执行结果。"""
 
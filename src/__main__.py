@@ -1,14 +1,26 @@
-"""Chat Hub 应用入口。允许通过 `python -m src` 启动服务。"""
+"""Chat Hub 应用入口。允许通过 `python -m src` 启动服务。
+
+子命令::
+
+    python -m src                                    # 启动服务（同 serve）
+    python -m src export bot-001 -o bot-001.ndjson.gz
+    python -m src export bot-001 --session sess-abc  # 输出到 stdout
+    python -m src import bot-001.ndjson.gz           # "-" 表示从 stdin 读取
+    python -m src import bot-001.ndjson.gz --drop-indexes  # 服务停止时的大批量导入
+"""
 
 from __future__ import annotations
 
-import uvicorn
+import argparse
+import sys
 
-from models import settings
+from src.models import settings
 
 
-def main() -> None:
+def serve(_: argparse.Namespace) -> None:
     """启动 Chat Hub 服务。"""
+    import uvicorn
+
     uvicorn.run(
         "src.api:app",
         host=settings.host,
@@ -17,5 +29,73 @@ def main() -> None:
     )
 
 
+def export(args: argparse.Namespace) -> None:
+    """将 bot（或单个会话）的数据导出为 NDJSON，输出文件以 .gz 结尾时压缩。"""
+    from src.database import open_database
+    from src.transfer import encode_chunks, export_ndjson
+
+    db = open_database(args.db)
+    compress = args.output is not None and args.output.endswith(".gz")
+    chunks = encode_chunks(export_ndjson(db, args.bot_id, args.session), compress=compress)
+    if args.output is None:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        return
+    with open(args.output, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def import_(args: argparse.Namespace) -> None:
+    """从 NDJSON 文件（可 gzip 压缩）批量导入数据，重复导入同一文件不会产生重复消息。"""
+    from src.database import open_database
+    from src.transfer import BulkImporter, LineDecoder
+
+    db = open_database(args.db)
+    decoder = LineDecoder()
+    f = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    try:
+        with BulkImporter(db, args.batch_size, drop_indexes=args.drop_indexes) as importer:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                for line in decoder.feed(chunk):
+                    importer.add_line(line)
+            for line in decoder.close():
+                importer.add_line(line)
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+    for table, count in importer.counts.items():
+        print(f"{table}: {count}", file=sys.stderr)
+    print(f"skipped messages: {importer.skipped}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """解析命令行并执行对应子命令。"""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Chat Hub")
+    parser.set_defaults(func=serve)
+    subparsers = parser.add_subparsers()
+
+    subparsers.add_parser("serve", help="启动服务").set_defaults(func=serve)
+
+    p = subparsers.add_parser("export", help="导出 bot / 会话数据为 NDJSON")
+    p.add_argument("bot_id")
+    p.add_argument("--session", help="只导出该会话")
+    p.add_argument("-o", "--output", help="输出文件，以 .gz 结尾时压缩；默认 stdout")
+    p.add_argument("--db", help="数据库文件，默认 {data_dir}/chat_hub.db")
+    p.set_defaults(func=export)
+
+    p = subparsers.add_parser("import", help="从 NDJSON 批量导入数据")
+    p.add_argument("input", help='输入文件（可 gzip 压缩），"-" 表示 stdin')
+    p.add_argument("--batch-size", type=int, default=settings.import_batch_size, help="每个事务写入的记录数")
+    p.add_argument(
+        "--drop-indexes", action="store_true", help="导入期间删除二级索引以加快写入，仅在服务停止时使用"
+    )
+    p.add_argument("--db", help="数据库文件，默认 {data_dir}/chat_hub.db")
+    p.set_defaults(func=import_)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
 if __name__ == "__main__":
     main()
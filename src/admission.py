@@ -0,0 +1,204 @@
+"""准入控制：按 bot / 会话限流，并限制全局并发。
+
+超出容量的请求立即以 `OverloadedError` 拒绝，而不是在 SQLite 写入或 LLM 调用前排起长队，
+从而让其他 bot 的尾延迟保持可预测。
+
+用法::
+
+    admission = AdmissionController.from_settings(settings)
+
+    try:
+        async with admission.admit(bot_id, session_id):
+            ...
+    except OverloadedError as e:
+        ...  # 返回 429 / ERROR 事件，e.retry_after 为建议重试间隔（秒）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models.settings import Settings
+
+
+class OverloadedError(Exception):
+    """请求被准入控制拒绝。"""
+
+    def __init__(self, reason: str, retry_after: float = 1.0) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+        """建议的重试间隔（秒）。"""
+
+
+# ── 令牌桶 ────────────────────────────────────────────────
+
+
+class TokenBucket:
+    """令牌桶：以 rate 个/秒补充，最多累积 burst 个。"""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """补充令牌后返回还需等待的秒数，有可用令牌时为 0（不消耗令牌）。"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def consume(self) -> None:
+        """消耗一个令牌，调用前应确认 wait_time() 为 0。"""
+        self._tokens -= 1
+
+    def try_acquire(self) -> float:
+        """尝试取一个令牌，成功返回 0，失败返回需要等待的秒数。"""
+        wait = self.wait_time()
+        if not wait:
+            self.consume()
+        return wait
+
+
+class RateLimiter:
+    """按键维护令牌桶，超过 max_keys 时淘汰最久未使用的桶。"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[tuple[str, ...], TokenBucket] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """rate 为 0 时不限流。"""
+        return self._rate > 0
+
+    def wait_time(self, *key: str) -> float:
+        """key 还需等待的秒数，有可用令牌时为 0（不消耗令牌）。"""
+        if not self.enabled:
+            return 0.0
+        return self._bucket(key).wait_time()
+
+    def consume(self, *key: str) -> None:
+        """为 key 消耗一个令牌，调用前应确认 wait_time() 为 0。"""
+        if self.enabled:
+            self._bucket(key).consume()
+
+    def try_acquire(self, *key: str) -> float:
+        """为 key 取一个令牌，成功返回 0，失败返回需要等待的秒数。"""
+        if not self.enabled:
+            return 0.0
+        return self._bucket(key).try_acquire()
+
+    def _bucket(self, key: tuple[str, ...]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self._rate, self._burst)
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+
+# ── 并发限制 ──────────────────────────────────────────────
+
+
+class ConcurrencyLimiter:
+    """全局并发上限 + 有界等待队列。
+
+    同时处理的请求数不超过 limit，超出时最多 max_queue 个请求排队等待 timeout 秒，
+    队列已满或等待超时则拒绝。limit 为 0 时不限制。
+    """
+
+    def __init__(self, limit: int, max_queue: int = 0, timeout: float = 5.0) -> None:
+        self._limit = limit
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        """当前排队等待的请求数。"""
+        return self._waiting
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """占用一个并发名额，无法获得时抛出 OverloadedError。"""
+        if self._semaphore is None:
+            yield
+            return
+        if self._semaphore.locked():
+            if self._waiting >= self._max_queue:
+                raise OverloadedError("服务繁忙：等待队列已满")
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self._timeout)
+            except TimeoutError as e:
+                raise OverloadedError("服务繁忙：排队超时") from e
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+# ── 组合 ──────────────────────────────────────────────────
+
+
+class AdmissionController:
+    """依次检查会话限流、bot 限流与全局并发。"""
+
+    def __init__(
+        self,
+        bot_limiter: RateLimiter,
+        session_limiter: RateLimiter,
+        concurrency: ConcurrencyLimiter,
+    ) -> None:
+        self.bot_limiter = bot_limiter
+        self.session_limiter = session_limiter
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AdmissionController:
+        """根据应用配置创建。"""
+        return cls(
+            RateLimiter(settings.bot_rate_limit, settings.bot_rate_burst),
+            RateLimiter(settings.session_rate_limit, settings.session_rate_burst),
+            ConcurrencyLimiter(settings.max_concurrency, settings.max_queue, settings.queue_timeout),
+        )
+
+    @asynccontextmanager
+    async def admit(self, bot_id: str, session_id: str) -> AsyncIterator[None]:
+        """准入一个请求，被拒绝时抛出 OverloadedError。
+
+        先检查会话限流再检查 bot 限流，两者都有令牌时才同时扣除：
+        被拒绝的请求不消耗任何令牌，单个会话刷屏不会耗尽同一 bot 其他会话的额度。
+        """
+        wait = self.session_limiter.wait_time(bot_id, session_id)
+        if wait:
+            raise OverloadedError(f"请求过于频繁：会话 {session_id}", retry_after=wait)
+        wait = self.bot_limiter.wait_time(bot_id)
+        if wait:
+            raise OverloadedError(f"请求过于频繁：bot {bot_id}", retry_after=wait)
+        self.session_limiter.consume(bot_id, session_id)
+        self.bot_limiter.consume(bot_id)
+        async with self.concurrency.acquire():
+            yield
@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import math
+import secrets
+import sqlite3
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import anyio.from_thread
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqliter import SqliterDB
 
 from chat_hub_protocol import (
@@ -14,39 +24,81 @@ from chat_hub_protocol import (
     Message,
     Role,
 )
-from src.config import settings
-from src.models import SessionConfig, StoredMemory, StoredMessage
+from src.admission import AdmissionController, OverloadedError
+from src.jobs import JobQueue
+from src.models import settings
 from src.session import SessionScope
+from src.storage import SqliteBackend, StorageBackend, create_backend
+from src.transfer import BulkImporter, LineDecoder, encode_chunks, export_ndjson
 
 # ── 初始化 ────────────────────────────────────────────────
+# 导入本模块不做任何 I/O：存储后端在 lifespan 中创建，任务队列在首次使用时打开数据库。
+
+storage: StorageBackend
+"""存储后端，在应用启动时创建。"""
+admission = AdmissionController.from_settings(settings)
+jobs = JobQueue(
+    f"{settings.data_dir}/jobs.db",
+    workers=settings.job_workers,
+    max_attempts=settings.job_max_attempts,
+    backoff=settings.job_backoff,
+    backoff_max=settings.job_backoff_max,
+    lease=settings.job_lease,
+)
 
-app = FastAPI(title="Chat Hub", version="0.1.0")
 
-db = SqliterDB(f"{settings.data_dir}/chat_hub.db")
-db.create_table(StoredMessage)
-db.create_table(StoredMemory)
-db.create_table(SessionConfig)
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """应用生命周期：启动时创建存储后端与后台任务线程，关闭时依次释放。"""
+    global storage
+    storage = create_backend(settings)
+    jobs.start()
+    yield
+    jobs.close()
+    storage.close()
+
+
+app = FastAPI(title="Chat Hub", version="0.1.0", lifespan=lifespan)
 
 
 def get_session(bot_id: str, session_id: str) -> SessionScope:
     """为指定的 bot_id + session_id 创建会话作用域。"""
-    return SessionScope(db, bot_id, session_id)
+    return SessionScope(storage, bot_id, session_id)
+
+
+def require_admin(authorization: str | None = Header(default=None)) -> None:
+    """校验管理接口的访问令牌；未配置 admin_token 时管理接口不可用。"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="管理接口未启用：请设置 CHAT_HUB_ADMIN_TOKEN")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(status_code=401, detail="无效的管理令牌", headers={"WWW-Authenticate": "Bearer"})
+
+
+def get_sqlite_backend() -> SqliteBackend:
+    """导入导出直接操作 SQLite 数据库，其他存储引擎不支持。"""
+    if not isinstance(storage, SqliteBackend):
+        raise HTTPException(status_code=501, detail=f"存储后端 {settings.storage_backend} 不支持导入导出")
+    return storage
 
 
 # ── 消息处理（暂时为空，后续实现）────────────────────────
 
 
-async def handle_message(session: SessionScope, payload: ChatPayload) -> ChatEvent:
+async def handle_message(session: SessionScope, payload: ChatPayload, background: BackgroundTasks) -> ChatEvent:
     """处理聊天消息。
 
     TODO: 在此实现实际的消息处理逻辑（调用 LLM、检索记忆等）。
+
+    Args:
+        background: 响应发送后执行的任务，用于投递后台任务，避免 jobs.db 写入阻塞请求。
     """
     # 存储用户消息
     content_dicts = [seg.model_dump() for seg in payload.message.content]
-    session.messages.add(role=payload.message.role.value, content=content_dicts)
+    record = session.messages.add(role=payload.message.role.value, content=content_dicts)
 
     # 占位响应
-    return ChatEvent(
+    event = ChatEvent(
         event=EventType.MESSAGE,
         bot_id=payload.bot_id,
         session_id=payload.session_id,
@@ -54,11 +106,18 @@ async def handle_message(session: SessionScope, payload: ChatPayload) -> ChatEve
         request_id=payload.request_id,
     )
 
+    # 非关键的后续工作（记忆提取、向量化、摘要等）由 @jobs.handler("message") 注册，在后台执行；
+    # 投递本身也在响应发送之后进行。未注册处理函数时不投递，任务队列也不会启动
+    if jobs.has_handler("message"):
+        background.add_task(jobs.enqueue, "message", payload.bot_id, payload.session_id, {"pk": record.pk})
+    return event
+
 
 async def handle_command(session: SessionScope, payload: CommandPayload) -> CommandResult:
     """处理控制命令。"""
     command = payload.command
     command_type = command.type
+    data: dict[str, Any] | None = None
 
     try:
         match command_type:
@@ -68,6 +127,17 @@ async def handle_command(session: SessionScope, payload: CommandPayload) -> Comm
                 session.memory.clear()
             case "set_context_length":
                 session.config.set("context_length", command.length)  # type: ignore[union-attr]
+            case "list_sessions":
+                sessions, total = session.sessions.list(
+                    offset=command.offset,  # type: ignore[union-attr]
+                    limit=command.limit,  # type: ignore[union-attr]
+                    order=command.order,  # type: ignore[union-attr]
+                    descending=command.descending,  # type: ignore[union-attr]
+                )
+                data = {"sessions": [s.model_dump(mode="json") for s in sessions], "total": total}
+            case "session_stats":
+                info = session.messages.stats()
+                data = {"session": None if info is None else info.model_dump(mode="json")}
             case _:
                 return CommandResult(
                     bot_id=payload.bot_id,
@@ -82,6 +152,7 @@ async def handle_command(session: SessionScope, payload: CommandPayload) -> Comm
             session_id=payload.session_id,
             command_type=command_type,
             success=True,
+            data=data,
             request_id=payload.request_id,
         )
     except Exception as e:
@@ -98,11 +169,29 @@ async def handle_command(session: SessionScope, payload: CommandPayload) -> Comm
 # ── 路由 ──────────────────────────────────────────────────
 
 
-@app.post("/chat", response_model=ChatEvent)
-async def chat_endpoint(payload: ChatPayload) -> ChatEvent:
-    """聊天接口：接收 ChatPayload，返回 ChatEvent。"""
-    session = get_session(payload.bot_id, payload.session_id)
-    return await handle_message(session, payload)
+@app.post("/chat", response_model=ChatEvent, responses={429: {"model": ChatEvent}})
+async def chat_endpoint(payload: ChatPayload, background: BackgroundTasks) -> ChatEvent | JSONResponse:
+    """聊天接口：接收 ChatPayload，返回 ChatEvent。
+
+    超出限流或并发容量时立即返回 429 与 ERROR 事件。
+    """
+    try:
+        async with admission.admit(payload.bot_id, payload.session_id):
+            session = get_session(payload.bot_id, payload.session_id)
+            return await handle_message(session, payload, background)
+    except OverloadedError as e:
+        event = ChatEvent(
+            event=EventType.ERROR,
+            bot_id=payload.bot_id,
+            session_id=payload.session_id,
+            error=e.reason,
+            request_id=payload.request_id,
+        )
+        return JSONResponse(
+            event.model_dump(mode="json"),
+            status_code=429,
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
 
 
 @app.post("/command", response_model=CommandResult)
@@ -112,6 +201,86 @@ async def command_endpoint(payload: CommandPayload) -> CommandResult:
     return await handle_command(session, payload)
 
 
+def _export_chunks(path: str, bot_id: str, session_id: str | None, compress: bool) -> Iterator[bytes]:
+    """在独立的数据库连接上导出，不与服务连接共享读事务。
+
+    StreamingResponse 在线程池中驱动同步迭代器，SQLite 读取与 gzip 压缩不占用事件循环；
+    相邻的块可能由不同的线程读取，因此连接关闭同线程检查（同一时刻只有一个线程使用）。
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    try:
+        yield from encode_chunks(export_ndjson(conn, bot_id, session_id), compress=compress)
+    finally:
+        conn.close()
+
+
+def _import_chunks(path: str, chunks: Iterator[bytes]) -> BulkImporter:
+    """在当前线程中打开独立的数据库连接并导入，在线程池中调用，批量写入不占用事件循环。"""
+    db = SqliterDB(path)
+    decoder = LineDecoder()
+    try:
+        with BulkImporter(db, settings.import_batch_size) as importer:
+            for chunk in chunks:
+                for line in decoder.feed(chunk):
+                    importer.add_line(line)
+            for line in decoder.close():
+                importer.add_line(line)
+    finally:
+        db.close()
+    return importer
+
+
+@app.get("/admin/export", dependencies=[Depends(require_admin)])
+async def export_endpoint(bot_id: str, session_id: str | None = None, compress: bool = False) -> StreamingResponse:
+    """导出接口：以 NDJSON 流式返回 bot（或单个会话）的数据，compress 为 true 时 gzip 压缩。"""
+    path = get_sqlite_backend().db.db_filename
+    filename = f"{bot_id}.ndjson.gz" if compress else f"{bot_id}.ndjson"
+    return StreamingResponse(
+        _export_chunks(path, bot_id, session_id, compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.post("/admin/import", dependencies=[Depends(require_admin)])
+async def import_endpoint(request: Request) -> dict[str, int]:
+    """导入接口：请求体为 NDJSON（可 gzip 压缩），返回各表写入的记录数与跳过的已存在消息数。
+
+    服务运行期间导入，保留二级索引以免并发请求退化为全表扫描。
+    导入失败时已提交的批次会保留，重新导入同一数据不会产生重复消息。
+    """
+    backend = get_sqlite_backend()
+    body = request.stream()
+
+    async def receive() -> bytes | None:
+        return await anext(body, None)
+
+    def chunks() -> Iterator[bytes]:
+        """在线程池中逐块拉取请求体。"""
+        while (chunk := anyio.from_thread.run(receive)) is not None:
+            yield chunk
+
+    try:
+        importer = await run_in_threadpool(_import_chunks, backend.db.db_filename, chunks())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    finally:
+        backend.invalidate_cache()
+    return {**importer.counts, "skipped": importer.skipped}
+
+
+@app.get("/admin/stats", dependencies=[Depends(require_admin)])
+async def stats_endpoint() -> dict[str, Any]:
+    """存储后端状态：引擎名称、热数据层命中率与内存占用等。"""
+    return storage.stats()
+
+
+@app.get("/admin/jobs", dependencies=[Depends(require_admin)])
+async def jobs_endpoint() -> dict[str, Any]:
+    """后台任务队列指标：队列深度、延迟与处理计数。"""
+    return jobs.stats()
+
+
 @app.get("/health")
 async def health() -> dict[str, str]:
     """健康检查。"""
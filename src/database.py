@@ -0,0 +1,94 @@
+"""数据库初始化。
+
+数据表结构的版本记录在 SQLite 的 `user_version` 中，版本一致时跳过建表与建索引，
+加快进程启动。修改 `src/models/tables.py` 中的表结构后需递增 `SCHEMA_VERSION`。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+from sqliter import SqliterDB
+from sqliter.model import BaseDBModel
+
+from src.models import SessionConfig, SessionSummary, StoredMemory, StoredMessage, settings
+
+SCHEMA_VERSION = 3
+"""当前数据表结构版本。"""
+
+TABLES = (StoredMessage, StoredMemory, SessionConfig, SessionSummary)
+"""服务持久化的全部数据表。"""
+
+_MESSAGES = StoredMessage.get_table_name()
+_SUMMARIES = SessionSummary.get_table_name()
+
+
+def ensure_schema(
+    db: SqliterDB,
+    tables: Iterable[type[BaseDBModel]],
+    version: int = SCHEMA_VERSION,
+    migrate: Callable[[SqliterDB], None] | None = None,
+) -> bool:
+    """确保数据表存在；已记录的结构版本与 version 一致时直接返回。
+
+    Args:
+        migrate: 版本不一致时在建表前调用，为已有的表补充新增的列（SQLiter 建表不会修改已有的表）。
+
+    Returns:
+        是否执行了建表。
+    """
+    conn = db.connect()
+    (stored,) = conn.execute("PRAGMA user_version").fetchone()
+    if stored == version:
+        return False
+    if migrate is not None:
+        migrate(db)
+    for model in tables:
+        db.create_table(model)
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+    conn.commit()
+    return True
+
+
+def rebuild_session_summaries(db: SqliterDB, bot_id: str | None = None) -> None:
+    """根据 messages 表全量重建会话摘要（全部 bot 或单个 bot）。
+
+    用于结构升级后的回填，以及绕过存储后端直接写入 messages 之后（如批量导入）。
+    """
+    where, params = ("WHERE bot_id = ?", (bot_id,)) if bot_id is not None else ("", ())
+    conn = db.connect()
+    with conn:
+        conn.execute(f'DELETE FROM "{_SUMMARIES}" {where}', params)
+        conn.execute(
+            f'INSERT INTO "{_SUMMARIES}" (bot_id, session_id, message_count, total_bytes, '
+            "first_pk, last_pk, first_at, last_at, created_at, updated_at) "
+            "SELECT bot_id, session_id, COUNT(*), SUM(LENGTH(CAST(content AS BLOB))), "
+            "MIN(pk), MAX(pk), MIN(created_at), MAX(created_at), MIN(created_at), MAX(created_at) "
+            f'FROM "{_MESSAGES}" {where} GROUP BY bot_id, session_id',
+            params,
+        )
+
+
+def _migrate(db: SqliterDB) -> None:
+    """为旧版本的 messages 表补充 uid 列。"""
+    conn = db.connect()
+    columns = {row[1] for row in conn.execute(f'PRAGMA table_info("{_MESSAGES}")')}
+    if columns and "uid" not in columns:
+        conn.execute(f'ALTER TABLE "{_MESSAGES}" ADD COLUMN uid TEXT')
+        conn.commit()
+
+
+def open_database(path: str | None = None) -> SqliterDB:
+    """以 WAL 模式打开数据库并确保所有数据表存在，默认使用 `{data_dir}/chat_hub.db`。
+
+    结构升级时为没有 uid 的已有消息生成随机 uid，并重建会话摘要。
+    """
+    db = SqliterDB(path or f"{settings.data_dir}/chat_hub.db")
+    # WAL 模式下读事务不阻塞写入：导出等长时间的读取期间服务仍可写入消息
+    db.connect().execute("PRAGMA journal_mode = WAL")
+    if ensure_schema(db, TABLES, migrate=_migrate):
+        conn = db.connect()
+        with conn:
+            conn.execute(f'UPDATE "{_MESSAGES}" SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL')
+        rebuild_session_summaries(db)
+    return db
@@ -0,0 +1,77 @@
+"""会话历史的轻量视图。
+
+`MessageRecord` 只保存数据库行的原始字段，`content` 在首次访问时才
+反序列化，适合只关心角色、条数或最后一条消息的调用方，以及导出 /
+扫描大会话时逐行处理的场景。
+
+用法::
+
+    for record in session.messages.iter():
+        print(record.role, record.raw_content)
+
+    last = session.messages.history(limit=1)[-1]
+    last.segments  # list[Segment]
+"""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from chat_hub_protocol import Segment
+    from pydantic import TypeAdapter
+
+
+_UNSET: Any = object()
+
+
+@cache
+def _segment_adapter() -> TypeAdapter[list[Segment]]:
+    """延迟构建 list[Segment] 的校验器，避免导入时开销。"""
+    from chat_hub_protocol import Segment
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(list[Segment])
+
+
+class MessageRecord:
+    """单条历史消息，`content` 延迟解码。"""
+
+    __slots__ = ("pk", "role", "created_at", "raw_content", "_content", "_segments")
+
+    def __init__(self, pk: int, role: str, raw_content: str, created_at: int) -> None:
+        self.pk = pk
+        self.role = role
+        self.raw_content = raw_content
+        """JSON 序列化的 list[Segment]，未解码。"""
+        self.created_at = created_at
+        self._content: list[dict[str, Any]] = _UNSET
+        self._segments: list[Segment] = _UNSET
+
+    @property
+    def content(self) -> list[dict[str, Any]]:
+        """消息内容段（dict 形式），首次访问时解码并缓存。"""
+        if self._content is _UNSET:
+            self._content = json.loads(self.raw_content)
+        return self._content
+
+    @property
+    def segments(self) -> list[Segment]:
+        """消息内容段（Segment 模型），首次访问时校验并缓存。"""
+        if self._segments is _UNSET:
+            self._segments = _segment_adapter().validate_json(self.raw_content)
+        return self._segments
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为 `MessageAccessor.list` 的返回格式。"""
+        return {
+            "pk": self.pk,
+            "role": self.role,
+            "content": self.content,
+            "created_at": self.created_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(pk={self.pk!r}, role={self.role!r}, created_at={self.created_at!r})"
@@ -0,0 +1,337 @@
+"""后台任务队列。
+
+把记忆提取、向量化、摘要、索引等非关键工作移出请求路径：`handle_message`
+在生成响应后投递任务，由工作线程池异步执行。任务持久化在独立的 SQLite 文件中，
+多个进程可共享同一个 jobs.db。
+
+- 领取的任务带有租约，执行期间由心跳线程续约；进程崩溃或退出后，
+  任务在租约过期时重新排队，由任一进程继续执行，不会打断其他进程正在执行的任务；
+
+- 同一会话的任务严格按投递顺序执行，前一个任务完成（或最终失败）前不会开始下一个；
+- 失败的任务按指数退避重试，超过最大次数后标记为 failed；
+- 并发度由工作线程数限制；
+- `stats()` 提供队列深度与延迟等指标。
+
+用法::
+
+    jobs = JobQueue("data/jobs.db", workers=2)
+
+    @jobs.handler("summarize")
+    def summarize(job: Job) -> None:
+        ...
+
+    jobs.start()
+    jobs.enqueue("summarize", "bot-001", "sess-abc", {"pk": 42})
+    jobs.stop()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqliter import SqliterDB
+
+from src.database import ensure_schema
+from src.models import StoredJob
+
+logger = logging.getLogger(__name__)
+
+_JOBS = StoredJob.get_table_name()
+
+JOBS_SCHEMA_VERSION = 2
+"""jobs.db 的数据表结构版本。"""
+
+JobHandler = Callable[["Job"], None]
+"""任务处理函数，抛出异常表示执行失败。"""
+
+
+def _migrate(db: SqliterDB) -> None:
+    """将旧版本的 jobs 表升级到当前结构（SQLiter 建表不会为已有的表补充新列）。"""
+    conn = db.connect()
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version == 1:
+        conn.execute(f"ALTER TABLE \"{_JOBS}\" ADD COLUMN owner TEXT DEFAULT ''")
+        conn.execute(f'ALTER TABLE "{_JOBS}" ADD COLUMN lease_until REAL DEFAULT 0')
+        conn.commit()
+
+
+class Job:
+    """传给处理函数的任务。"""
+
+    __slots__ = ("pk", "kind", "bot_id", "session_id", "payload", "attempts")
+
+    def __init__(self, pk: int, kind: str, bot_id: str, session_id: str, payload: str, attempts: int) -> None:
+        self.pk = pk
+        self.kind = kind
+        self.bot_id = bot_id
+        self.session_id = session_id
+        self.payload: dict[str, Any] = json.loads(payload)
+        self.attempts = attempts
+        """包含本次在内的执行次数。"""
+
+    def __repr__(self) -> str:
+        return f"Job(pk={self.pk!r}, kind={self.kind!r}, bot_id={self.bot_id!r}, session_id={self.session_id!r})"
+
+
+class JobQueue:
+    """基于 SQLite 的持久化任务队列与工作线程池。
+
+    数据库在首次使用（投递、启动线程或读取指标）时才打开，创建实例本身没有 I/O。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        workers: int = 2,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        backoff_max: float = 300.0,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+    ) -> None:
+        self._path = path
+        self._owner = uuid.uuid4().hex
+        """本实例的标识，记录在其领取的任务上。"""
+        self._conn: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._poll_interval = poll_interval
+        self._lease = lease
+
+        self._handlers: dict[str, JobHandler] = {}
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._threads: list[threading.Thread] = []
+        self._heartbeat_thread: threading.Thread | None = None
+        self._heartbeat_stop = threading.Event()
+        self._processed = 0
+        self._retried = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """任务数据库连接，调用方需持有 _db_lock。"""
+        if self._conn is None:
+            schema_db = SqliterDB(self._path)
+            ensure_schema(schema_db, (StoredJob,), JOBS_SCHEMA_VERSION, migrate=_migrate)
+            schema_db.close()
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._conn = conn
+        return self._conn
+
+    # ── 注册与投递 ───────────────────────────────────
+
+    def handler(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        """装饰器：注册 kind 类型任务的处理函数。"""
+
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            return func
+
+        return decorator
+
+    def has_handler(self, kind: str) -> bool:
+        """是否已注册 kind 类型的处理函数。"""
+        return kind in self._handlers
+
+    def enqueue(self, kind: str, bot_id: str, session_id: str, payload: dict[str, Any] | None = None) -> int | None:
+        """投递一个任务，返回任务 pk；未注册处理函数的任务类型直接忽略并返回 None。"""
+        if kind not in self._handlers:
+            return None
+        now = time.time()
+        cursor = self._execute(
+            f'INSERT INTO "{_JOBS}" (kind, bot_id, session_id, payload, status, owner, lease_until, attempts, run_at, '
+            "last_error, created_at, updated_at) VALUES (?, ?, ?, ?, 'pending', '', 0, 0, ?, '', ?, ?)",
+            (kind, bot_id, session_id, json.dumps(payload or {}, ensure_ascii=False), now, int(now), int(now)),
+        )
+        with self._wakeup:
+            self._wakeup.notify()
+        return cursor.lastrowid
+
+    # ── 工作线程 ─────────────────────────────────────
+
+    def start(self) -> None:
+        """启动工作线程池与租约心跳线程。
+
+        处理函数需在此之前注册；workers 为 0 或没有注册任何处理函数时不启动线程，也不打开数据库。
+        """
+        self._stopping = False
+        self._heartbeat_stop.clear()
+        if not self._workers or not self._handlers:
+            return
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        """停止工作线程，等待正在执行的任务完成。"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout)
+            self._heartbeat_thread = None
+
+    def close(self) -> None:
+        """停止工作线程并关闭数据库连接。"""
+        self.stop()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def run_pending(self) -> int:
+        """在当前线程中执行所有已到期的任务，返回执行的任务数（用于测试与脚本）。
+
+        未调用 start() 时没有心跳线程续约，单个任务的执行时间应短于租约时长。
+        """
+        count = 0
+        while (job := self._claim()) is not None:
+            self._run(job)
+            count += 1
+        return count
+
+    def _worker(self) -> None:
+        while not self._stopping:
+            job = self._claim()
+            if job is None:
+                timeout = self._next_wait()
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(timeout)
+                continue
+            self._run(job)
+
+    def _heartbeat(self) -> None:
+        """定期为本实例执行中的任务续约。"""
+        while not self._heartbeat_stop.wait(self._lease / 3):
+            self._execute(
+                f"UPDATE \"{_JOBS}\" SET lease_until = ? WHERE status = 'running' AND owner = ?",
+                (time.time() + self._lease, self._owner),
+            )
+
+    def _next_wait(self) -> float:
+        """空闲时的等待时间：不超过 poll_interval，且在最早的重试到期时醒来。"""
+        with self._db_lock:
+            (run_at,) = self._db.execute(
+                f"SELECT MIN(run_at) FROM \"{_JOBS}\" WHERE status = 'pending'"
+            ).fetchone()
+        if run_at is None:
+            return self._poll_interval
+        return min(max(run_at - time.time(), 0.01), self._poll_interval)
+
+    def _claim(self) -> Job | None:
+        """原子地领取一个到期任务；同一会话中有更早的未完成任务时跳过。
+
+        领取前先将租约已过期（持有进程已退出）的执行中任务重新排队。
+        """
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                self._db.execute(
+                    f"UPDATE \"{_JOBS}\" SET status = 'pending', owner = '' "
+                    "WHERE status = 'running' AND lease_until < ?",
+                    (now,),
+                )
+                row = self._db.execute(
+                    f'SELECT pk, kind, bot_id, session_id, payload, attempts FROM "{_JOBS}" AS j '
+                    "WHERE status = 'pending' AND run_at <= ? AND NOT EXISTS ("
+                    f'  SELECT 1 FROM "{_JOBS}" AS p WHERE p.bot_id = j.bot_id AND p.session_id = j.session_id'
+                    "  AND p.pk < j.pk AND p.status IN ('pending', 'running')"
+                    ") ORDER BY pk LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        f"UPDATE \"{_JOBS}\" SET status = 'running', attempts = attempts + 1, owner = ?, "
+                        "lease_until = ? WHERE pk = ?",
+                        (self._owner, now + self._lease, row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        pk, kind, bot_id, session_id, payload, attempts = row
+        return Job(pk, kind, bot_id, session_id, payload, attempts + 1)
+
+    def _run(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"未注册的任务类型: {job.kind}")
+            handler(job)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            # 只处理仍由本实例持有的任务：租约过期后任务可能已被其他进程重新领取
+            self._execute(f'DELETE FROM "{_JOBS}" WHERE pk = ? AND owner = ?', (job.pk, self._owner))
+            self._processed += 1
+
+    def _fail(self, job: Job, error: Exception) -> None:
+        if job.attempts >= self._max_attempts:
+            logger.error("任务 %r 在 %d 次尝试后失败", job, job.attempts, exc_info=error)
+            self._execute(
+                f"UPDATE \"{_JOBS}\" SET status = 'failed', owner = '', last_error = ? WHERE pk = ? AND owner = ?",
+                (repr(error), job.pk, self._owner),
+            )
+            return
+        delay = min(self._backoff * 2 ** (job.attempts - 1), self._backoff_max)
+        logger.warning("任务 %r 第 %d 次执行失败，%.1f 秒后重试: %r", job, job.attempts, delay, error)
+        self._execute(
+            f"UPDATE \"{_JOBS}\" SET status = 'pending', owner = '', run_at = ?, last_error = ? "
+            "WHERE pk = ? AND owner = ?",
+            (time.time() + delay, repr(error), job.pk, self._owner),
+        )
+        self._retried += 1
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> sqlite3.Cursor:
+        with self._db_lock:
+            return self._db.execute(sql, params)
+
+    # ── 指标 ─────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """队列深度、延迟与处理计数。
+
+        lag 为最早一个已到期但尚未执行的任务的等待时间（秒）。
+        没有注册处理函数且数据库尚未打开时直接返回空指标。
+        """
+        now = time.time()
+        if self._conn is None and not self._handlers:
+            return {"workers": 0, "pending": 0, "running": 0, "failed": 0, "lag": 0.0, "processed": 0, "retried": 0}
+        with self._db_lock:
+            counts = dict(self._db.execute(f'SELECT status, COUNT(*) FROM "{_JOBS}" GROUP BY status').fetchall())
+            (oldest,) = self._db.execute(
+                f"SELECT MIN(run_at) FROM \"{_JOBS}\" WHERE status = 'pending' AND run_at <= ?", (now,)
+            ).fetchone()
+        return {
+            "workers": len(self._threads),
+            "pending": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "failed": counts.get("failed", 0),
+            "lag": 0.0 if oldest is None else now - oldest,
+            "processed": self._processed,
+            "retried": self._retried,
+        }
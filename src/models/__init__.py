@@ -1,5 +1,11 @@
 from .settings import settings
+from .tables import SessionConfig, SessionSummary, StoredJob, StoredMemory, StoredMessage
 
 __all__ = [
     "settings",
-]
\ No newline at end of file
+    "SessionConfig",
+    "SessionSummary",
+    "StoredJob",
+    "StoredMemory",
+    "StoredMessage",
+]
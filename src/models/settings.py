@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from typing import Literal, Self
+
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +18,63 @@ class Settings(BaseSettings):
     debug: bool = False
     data_dir: str = "data"
     """持久化数据存储目录。"""
+    admin_token: str | None = None
+    """/admin/* 接口的访问令牌（`Authorization: Bearer <token>`），为空时这些接口不可用。"""
+    storage_backend: Literal["sqlite", "memory"] = "sqlite"
+    """存储引擎：sqlite 持久化到 `{data_dir}/chat_hub.db`，memory 仅保存在内存中。"""
+    memory_max_messages: int = Field(1000, ge=1)
+    """memory 引擎下每个会话保留的最大消息数。"""
+    memory_snapshot_path: str | None = None
+    """memory 引擎的快照文件，为空时不落盘。"""
+    memory_snapshot_interval: float = 60.0
+    """memory 引擎定时写快照的间隔（秒），0 表示仅在关闭时写入。"""
+    hot_tier_enabled: bool = True
+    """sqlite 引擎是否在内存中缓存活跃会话的最近消息。"""
+    hot_tier_messages: int = Field(50, ge=1)
+    """热数据层每个会话缓存的最大消息数，应不小于常用的 context_length。"""
+    hot_tier_bytes: int = 64 * 1024 * 1024
+    """热数据层的总内存预算（字节），超出时淘汰最久未使用的会话。"""
+    hot_tier_ttl: float = 300.0
+    """会话空闲超过该秒数后移出热数据层。"""
+
+    # ── 后台任务队列 ─────────────────────────────────
+    job_workers: int = 2
+    """后台任务工作线程数，0 表示只入队不执行。"""
+    job_max_attempts: int = 5
+    """任务最大执行次数，超过后标记为 failed。"""
+    job_backoff: float = 1.0
+    """首次重试的退避时间（秒），之后每次翻倍。"""
+    job_backoff_max: float = 300.0
+    """重试退避时间上限（秒）。"""
+    job_lease: float = 60.0
+    """执行中任务的租约时长（秒），持有进程退出后任务在租约过期时由其他进程重新执行。"""
+    import_batch_size: int = 5000
+    """批量导入时每个事务写入的记录数。"""
+
+    # ── 准入控制（0 表示不限制）──────────────────────
+    bot_rate_limit: float = Field(20.0, ge=0)
+    """每个 bot 每秒允许的聊天请求数。"""
+    bot_rate_burst: int = Field(40, ge=0)
+    """每个 bot 允许的突发请求数，限流开启时至少为 1。"""
+    session_rate_limit: float = Field(2.0, ge=0)
+    """每个会话每秒允许的聊天请求数。"""
+    session_rate_burst: int = Field(5, ge=0)
+    """每个会话允许的突发请求数，限流开启时至少为 1。"""
+    max_concurrency: int = 64
+    """同时处理的聊天请求上限。"""
+    max_queue: int = 128
+    """并发已满时允许排队等待的请求数，超出立即拒绝。"""
+    queue_timeout: float = 5.0
+    """排队等待的最长时间（秒）。"""
+
+    @model_validator(mode="after")
+    def _check_bursts(self) -> Self:
+        """限流开启时突发数为 0 会拒绝所有请求。"""
+        if self.bot_rate_limit > 0 and self.bot_rate_burst < 1:
+            raise ValueError("bot_rate_limit 大于 0 时 bot_rate_burst 至少为 1")
+        if self.session_rate_limit > 0 and self.session_rate_burst < 1:
+            raise ValueError("session_rate_limit 大于 0 时 session_rate_burst 至少为 1")
+        return self
 
 
 settings = Settings()
@@ -0,0 +1,102 @@
+"""SQLiter 数据模型定义。
+
+定义持久化到 SQLite 的数据表结构，供 SessionScope 使用。
+"""
+
+from __future__ import annotations
+
+from sqliter.model import BaseDBModel
+
+
+class StoredMessage(BaseDBModel):
+    """持久化的聊天消息。"""
+
+    bot_id: str
+    session_id: str
+    role: str
+    content: str
+    """JSON 序列化的 list[Segment]。"""
+    uid: str | None = None
+    """全局唯一的消息标识，随导出数据迁移，导入时据此去重。"""
+
+    class Meta:
+        table_name = "messages"
+        indexes = [("bot_id", "session_id")]
+        unique_indexes = ["uid"]
+
+
+class StoredMemory(BaseDBModel):
+    """持久化的长期记忆（按 bot 维度）。"""
+
+    bot_id: str
+    key: str
+    value: str
+    """JSON 序列化的任意值。"""
+
+    class Meta:
+        table_name = "memories"
+        unique_together = [("bot_id", "key")]
+        indexes = [("bot_id", "key")]
+
+
+class SessionConfig(BaseDBModel):
+    """会话级配置。"""
+
+    bot_id: str
+    session_id: str
+    key: str
+    value: str
+    """JSON 序列化的配置值。"""
+
+    class Meta:
+        table_name = "session_configs"
+        unique_together = [("bot_id", "session_id", "key")]
+        indexes = [("bot_id", "session_id", "key")]
+
+
+class SessionSummary(BaseDBModel):
+    """会话统计摘要，在消息写入 / 清除时增量维护，避免扫描 messages 表。"""
+
+    bot_id: str
+    session_id: str
+    message_count: int = 0
+    total_bytes: int = 0
+    """消息内容（JSON 序列化后，UTF-8）的总字节数。"""
+    first_pk: int = 0
+    last_pk: int = 0
+    first_at: int = 0
+    """第一条消息的时间戳（Unix 秒）。"""
+    last_at: int = 0
+    """最后一条消息的时间戳（Unix 秒）。"""
+
+    class Meta:
+        table_name = "session_summaries"
+        unique_indexes = [("bot_id", "session_id")]
+        indexes = [("bot_id", "last_at")]
+
+
+class StoredJob(BaseDBModel):
+    """后台任务队列中的任务（存储于独立的 jobs.db）。"""
+
+    kind: str
+    """任务类型，对应注册的处理函数。"""
+    bot_id: str
+    session_id: str
+    payload: str
+    """JSON 序列化的任务参数。"""
+    status: str = "pending"
+    """pending / running / failed，执行成功的任务直接删除。"""
+    owner: str = ""
+    """执行中的任务所属的 JobQueue 实例。"""
+    lease_until: float = 0.0
+    """执行中任务的租约到期时间（Unix 时间戳），持有者定期续约，过期后任务重新排队。"""
+    attempts: int = 0
+    """已执行次数。"""
+    run_at: float = 0.0
+    """最早可执行时间（Unix 时间戳），重试时按退避时间后移。"""
+    last_error: str = ""
+    """最近一次失败的错误信息。"""
+
+    class Meta:
+        table_name = "jobs"
+        indexes = [("status", "run_at"), ("bot_id", "session_id")]
@@ -2,13 +2,19 @@
 
 为每个 (bot_id, session_id) 组合提供一个 SessionScope 实例，
 通过它访问该会话下的消息、记忆、配置等数据，无需重复传递 ID。
+数据的实际读写由 `src.storage` 中的存储后端完成。
 
 用法::
 
-    session = SessionScope(db, bot_id="bot-001", session_id="sess-abc")
+    session = SessionScope(storage, bot_id="bot-001", session_id="sess-abc")
 
     session.messages.add(role="user", content=[{"type": "text", "text": "你好"}])
     session.messages.list()
+    session.messages.history(limit=20)   # list[MessageRecord]，content 延迟解码
+    session.messages.iter()              # 逐行流式读取，内存占用恒定
+    session.messages.stats()             # SessionInfo，来自增量维护的会话摘要
+
+    session.sessions.list(limit=20, order="last_active")  # 该 bot 的会话列表
     session.messages.clear()
 
     session.memory.set("user_name", "小明")
@@ -21,11 +27,16 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from src.history import MessageRecord
+from src.storage import StorageBackend
 
-from sqliter import SqliterDB
+if TYPE_CHECKING:
+    from chat_hub_protocol import SessionInfo
 
-from src.models import SessionConfig, StoredMemory, StoredMessage
+    from src.storage.base import SessionOrder
 
 
 # ── 子访问器 ──────────────────────────────────────────────
@@ -34,152 +45,111 @@ from src.models import SessionConfig, StoredMemory, StoredMessage
 class MessageAccessor:
     """会话消息（短期记忆 / 上下文）访问器。"""
 
-    def __init__(self, db: SqliterDB, bot_id: str, session_id: str) -> None:
-        self._db = db
+    def __init__(self, storage: StorageBackend, bot_id: str, session_id: str) -> None:
+        self._storage = storage
         self._bot_id = bot_id
         self._session_id = session_id
 
-    def add(self, role: str, content: list[dict[str, Any]]) -> StoredMessage:
+    def add(self, role: str, content: list[dict[str, Any]]) -> MessageRecord:
         """添加一条消息。"""
-        msg = StoredMessage(
-            bot_id=self._bot_id,
-            session_id=self._session_id,
-            role=role,
-            content=json.dumps(content, ensure_ascii=False),
+        return self._storage.add_message(
+            self._bot_id, self._session_id, role, json.dumps(content, ensure_ascii=False)
         )
-        return self._db.insert(msg)
 
     def list(self, limit: int | None = None) -> list[dict[str, Any]]:
         """获取消息列表（正序），limit 为取最近 N 条。"""
-        query = (
-            self._db.select(StoredMessage)
-            .filter(bot_id=self._bot_id, session_id=self._session_id)
-            .order("pk")
-        )
-        rows = query.fetch_all()
-        if limit is not None and len(rows) > limit:
-            rows = rows[-limit:]
-        return [
-            {
-                "pk": r.pk,
-                "role": r.role,
-                "content": json.loads(r.content),
-                "created_at": r.created_at,
-            }
-            for r in rows
-        ]
+        return [r.to_dict() for r in self.history(limit)]
+
+    def history(self, limit: int | None = None) -> list[MessageRecord]:
+        """获取消息记录（正序），limit 为取最近 N 条；content 在访问时才解码。"""
+        return self._storage.message_history(self._bot_id, self._session_id, limit)
+
+    def iter(self) -> Iterator[MessageRecord]:
+        """按正序逐条读取该会话的消息，不一次性加载全部结果。"""
+        return self._storage.iter_messages(self._bot_id, self._session_id)
 
     def clear(self) -> None:
         """清除该会话的所有消息。"""
-        self._db.select(StoredMessage).filter(
-            bot_id=self._bot_id, session_id=self._session_id
-        ).delete()
+        self._storage.clear_messages(self._bot_id, self._session_id)
+
+    def stats(self) -> SessionInfo | None:
+        """该会话的统计信息（消息数、字节数、首末消息），无消息时返回 None。"""
+        return self._storage.session_stats(self._bot_id, self._session_id)
+
+
+class SessionListAccessor:
+    """会话列表访问器（按 bot 维度）。"""
+
+    def __init__(self, storage: StorageBackend, bot_id: str) -> None:
+        self._storage = storage
+        self._bot_id = bot_id
+
+    def list(
+        self,
+        offset: int = 0,
+        limit: int = 20,
+        order: SessionOrder = "last_active",
+        descending: bool = True,
+    ) -> tuple[list[SessionInfo], int]:
+        """分页列出该 bot 下有消息的会话，返回 (当前页, 会话总数)。"""
+        return self._storage.list_sessions(
+            self._bot_id, offset=offset, limit=limit, order=order, descending=descending
+        )
 
 
 class MemoryAccessor:
     """长期记忆访问器（按 bot 维度）。"""
 
-    def __init__(self, db: SqliterDB, bot_id: str) -> None:
-        self._db = db
+    def __init__(self, storage: StorageBackend, bot_id: str) -> None:
+        self._storage = storage
         self._bot_id = bot_id
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取一条记忆。"""
-        row = (
-            self._db.select(StoredMemory)
-            .filter(bot_id=self._bot_id, key=key)
-            .fetch_one()
-        )
-        if row is None:
+        value = self._storage.get_memory(self._bot_id, key)
+        if value is None:
             return default
-        return json.loads(row.value)
+        return json.loads(value)
 
     def set(self, key: str, value: Any) -> None:
         """设置一条记忆（已存在则覆盖）。"""
-        existing = (
-            self._db.select(StoredMemory)
-            .filter(bot_id=self._bot_id, key=key)
-            .fetch_one()
-        )
-        if existing is not None:
-            existing.value = json.dumps(value, ensure_ascii=False)
-            self._db.update(existing)
-        else:
-            self._db.insert(
-                StoredMemory(
-                    bot_id=self._bot_id,
-                    key=key,
-                    value=json.dumps(value, ensure_ascii=False),
-                )
-            )
+        self._storage.set_memory(self._bot_id, key, json.dumps(value, ensure_ascii=False))
 
     def list_all(self) -> dict[str, Any]:
         """列出该 bot 的所有记忆。"""
-        rows = (
-            self._db.select(StoredMemory)
-            .filter(bot_id=self._bot_id)
-            .fetch_all()
-        )
-        return {r.key: json.loads(r.value) for r in rows}
+        return {k: json.loads(v) for k, v in self._storage.list_memories(self._bot_id).items()}
 
     def delete(self, key: str) -> None:
         """删除一条记忆。"""
-        self._db.select(StoredMemory).filter(
-            bot_id=self._bot_id, key=key
-        ).delete()
+        self._storage.delete_memory(self._bot_id, key)
 
     def clear(self) -> None:
         """清除该 bot 的所有记忆。"""
-        self._db.select(StoredMemory).filter(bot_id=self._bot_id).delete()
+        self._storage.clear_memories(self._bot_id)
 
 
 class ConfigAccessor:
     """会话级配置访问器。"""
 
-    def __init__(self, db: SqliterDB, bot_id: str, session_id: str) -> None:
-        self._db = db
+    def __init__(self, storage: StorageBackend, bot_id: str, session_id: str) -> None:
+        self._storage = storage
         self._bot_id = bot_id
         self._session_id = session_id
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值。"""
-        row = (
-            self._db.select(SessionConfig)
-            .filter(bot_id=self._bot_id, session_id=self._session_id, key=key)
-            .fetch_one()
-        )
-        if row is None:
+        value = self._storage.get_config(self._bot_id, self._session_id, key)
+        if value is None:
             return default
-        return json.loads(row.value)
+        return json.loads(value)
 
     def set(self, key: str, value: Any) -> None:
         """设置配置值（已存在则覆盖）。"""
-        existing = (
-            self._db.select(SessionConfig)
-            .filter(bot_id=self._bot_id, session_id=self._session_id, key=key)
-            .fetch_one()
-        )
-        if existing is not None:
-            existing.value = json.dumps(value, ensure_ascii=False)
-            self._db.update(existing)
-        else:
-            self._db.insert(
-                SessionConfig(
-                    bot_id=self._bot_id,
-                    session_id=self._session_id,
-                    key=key,
-                    value=json.dumps(value, ensure_ascii=False),
-                )
-            )
+        self._storage.set_config(self._bot_id, self._session_id, key, json.dumps(value, ensure_ascii=False))
 
     def list_all(self) -> dict[str, Any]:
         """列出该会话的所有配置。"""
-        rows = (
-            self._db.select(SessionConfig)
-            .filter(bot_id=self._bot_id, session_id=self._session_id)
-            .fetch_all()
-        )
-        return {r.key: json.loads(r.value) for r in rows}
+        return {k: json.loads(v) for k, v in self._storage.list_configs(self._bot_id, self._session_id).items()}
 
 
 # ── 会话路由 ──────────────────────────────────────────────
@@ -188,22 +158,27 @@ class ConfigAccessor:
 class SessionScope:
     """会话作用域，绑定 bot_id + session_id，路由到各数据访问器。"""
 
-    def __init__(self, db: SqliterDB, bot_id: str, session_id: str) -> None:
+    def __init__(self, storage: StorageBackend, bot_id: str, session_id: str) -> None:
         self.bot_id = bot_id
         self.session_id = session_id
-        self._db = db
+        self._storage = storage
 
     @property
     def messages(self) -> MessageAccessor:
         """该会话的消息（短期记忆 / 上下文）。"""
-        return MessageAccessor(self._db, self.bot_id, self.session_id)
+        return MessageAccessor(self._storage, self.bot_id, self.session_id)
+
+    @property
+    def sessions(self) -> SessionListAccessor:
+        """该 bot 的会话列表。"""
+        return SessionListAccessor(self._storage, self.bot_id)
 
     @property
     def memory(self) -> MemoryAccessor:
         """该 bot 的长期记忆。"""
-        return MemoryAccessor(self._db, self.bot_id)
+        return MemoryAccessor(self._storage, self.bot_id)
 
     @property
     def config(self) -> ConfigAccessor:
         """该会话的配置。"""
-        return ConfigAccessor(self._db, self.bot_id, self.session_id)
+        return ConfigAccessor(self._storage, self.bot_id, self.session_id)
@@ -0,0 +1,41 @@
+"""可插拔存储后端。"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .base import StorageBackend
+from .hot import HotTier
+from .inmemory import InMemoryBackend
+from .sqlite import SqliteBackend
+
+if TYPE_CHECKING:
+    from src.models.settings import Settings
+
+__all__ = [
+    "HotTier",
+    "InMemoryBackend",
+    "SqliteBackend",
+    "StorageBackend",
+    "create_backend",
+]
+
+
+def create_backend(settings: Settings) -> StorageBackend:
+    """根据 `settings.storage_backend` 创建存储后端。"""
+    match settings.storage_backend:
+        case "sqlite":
+            from src.database import open_database
+
+            hot = None
+            if settings.hot_tier_enabled:
+                hot = HotTier(settings.hot_tier_messages, settings.hot_tier_bytes, settings.hot_tier_ttl)
+            return SqliteBackend(open_database(f"{settings.data_dir}/chat_hub.db"), hot)
+        case "memory":
+            return InMemoryBackend(
+                max_messages=settings.memory_max_messages,
+                snapshot_path=settings.memory_snapshot_path,
+                snapshot_interval=settings.memory_snapshot_interval,
+            )
+        case other:
+            raise ValueError(f"未知存储后端: {other}")
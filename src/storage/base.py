@@ -0,0 +1,105 @@
+"""存储后端协议。
+
+`SessionScope` 的各访问器只通过该协议读写数据，新增存储引擎时实现这些方法即可，
+无需改动 `api.py` 或访问器。所有值（消息内容、记忆、配置）均以 JSON 字符串传递，
+序列化由访问器负责。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+from src.history import MessageRecord
+
+if TYPE_CHECKING:
+    from chat_hub_protocol import SessionInfo
+
+SessionOrder = Literal["last_active", "first_active", "message_count", "total_bytes"]
+"""会话列表的排序字段。"""
+
+
+class StorageBackend(Protocol):
+    """存储后端需要实现的操作。"""
+
+    # ── 消息 ─────────────────────────────────────────
+
+    def add_message(self, bot_id: str, session_id: str, role: str, content: str) -> MessageRecord:
+        """追加一条消息，content 为 JSON 序列化的 list[Segment]。"""
+        ...
+
+    def message_history(self, bot_id: str, session_id: str, limit: int | None = None) -> list[MessageRecord]:
+        """获取消息记录（正序），limit 为取最近 N 条。"""
+        ...
+
+    def iter_messages(self, bot_id: str, session_id: str) -> Iterator[MessageRecord]:
+        """按正序逐条读取消息。"""
+        ...
+
+    def clear_messages(self, bot_id: str, session_id: str) -> None:
+        """清除会话的所有消息。"""
+        ...
+
+    # ── 会话统计 ─────────────────────────────────────
+
+    def session_stats(self, bot_id: str, session_id: str) -> SessionInfo | None:
+        """获取会话统计信息，会话无消息时返回 None。"""
+        ...
+
+    def list_sessions(
+        self,
+        bot_id: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        order: SessionOrder = "last_active",
+        descending: bool = True,
+    ) -> tuple[list[SessionInfo], int]:
+        """分页列出 bot 下有消息的会话，返回 (当前页, 会话总数)。"""
+        ...
+
+    # ── 长期记忆（按 bot 维度）───────────────────────
+
+    def get_memory(self, bot_id: str, key: str) -> str | None:
+        """获取一条记忆，不存在时返回 None。"""
+        ...
+
+    def set_memory(self, bot_id: str, key: str, value: str) -> None:
+        """设置一条记忆（已存在则覆盖）。"""
+        ...
+
+    def list_memories(self, bot_id: str) -> dict[str, str]:
+        """列出 bot 的所有记忆。"""
+        ...
+
+    def delete_memory(self, bot_id: str, key: str) -> None:
+        """删除一条记忆。"""
+        ...
+
+    def clear_memories(self, bot_id: str) -> None:
+        """清除 bot 的所有记忆。"""
+        ...
+
+    # ── 会话配置 ─────────────────────────────────────
+
+    def get_config(self, bot_id: str, session_id: str, key: str) -> str | None:
+        """获取配置值，不存在时返回 None。"""
+        ...
+
+    def set_config(self, bot_id: str, session_id: str, key: str, value: str) -> None:
+        """设置配置值（已存在则覆盖）。"""
+        ...
+
+    def list_configs(self, bot_id: str, session_id: str) -> dict[str, str]:
+        """列出会话的所有配置。"""
+        ...
+
+    # ── 统计与生命周期 ───────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """后端状态（引擎名称、缓存命中率、内存占用等），用于监控。"""
+        ...
+
+    def close(self) -> None:
+        """释放资源（关闭连接、写出快照等）。"""
+        ...
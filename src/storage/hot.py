@@ -0,0 +1,194 @@
+"""热数据层：在内存中缓存活跃会话的最近消息。
+
+大多数轮次只需要最近 `context_length` 条消息，`HotTier` 为每个活跃会话保留
+最多 max_messages 条最近消息的环形缓冲区，命中时无需访问磁盘。
+数据库始终是唯一数据源：缓冲区在写入时追加，未命中时由调用方从数据库回填。
+
+缓存是进程私有的，同一数据库可能被其他进程（如多个 uvicorn worker）写入。
+因此读取时调用方需传入数据库中该会话当前的最后一条消息 pk（来自 `session_summaries`），
+与缓冲区末尾不一致即视为过期并丢弃；追加时同样核对写入前的最后一条 pk，
+中间缺失了其他进程写入的消息时重新开始缓冲。由于 pk 自增且不复用，末尾 pk 相同即说明缓冲区仍是最新的。
+
+会话按最近使用顺序排列，总字节数超过 max_bytes 或空闲超过 ttl 秒时淘汰。
+缓存只保存原始行，每次读取都构造新的 `MessageRecord`，
+因此调用方解码出的内容不会滞留在缓存中，字节统计保持准确。
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+from src.history import MessageRecord
+
+_Row = tuple[int, str, str, int]
+"""(pk, role, raw_content, created_at)"""
+
+_ROW_OVERHEAD = 120
+"""每行除 content 字符串外的估算开销（tuple、int、role 引用等），单位字节。"""
+
+
+def _row_size(row: _Row) -> int:
+    return sys.getsizeof(row[2]) + _ROW_OVERHEAD
+
+
+class _HotSession:
+    __slots__ = ("rows", "complete", "size", "touched")
+
+    def __init__(self, max_messages: int) -> None:
+        self.rows: deque[_Row] = deque(maxlen=max_messages)
+        self.complete = False
+        """rows 是否包含该会话的全部消息。"""
+        self.size = 0
+        self.touched = time.monotonic()
+
+    @property
+    def last_pk(self) -> int | None:
+        """缓冲区中最后一条消息的 pk，为空时为 None。"""
+        return self.rows[-1][0] if self.rows else None
+
+
+class HotTier:
+    """按会话缓存最近消息的 LRU 热数据层。"""
+
+    def __init__(self, max_messages: int = 50, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0) -> None:
+        self._max_messages = max_messages
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[tuple[str, str], _HotSession] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    @property
+    def max_messages(self) -> int:
+        """每个会话缓存的最大消息数。"""
+        return self._max_messages
+
+    def get(self, bot_id: str, session_id: str, limit: int | None, last_pk: int | None) -> list[MessageRecord] | None:
+        """读取最近 limit 条消息（正序），缓存无法完整满足时返回 None。
+
+        Args:
+            last_pk: 数据库中该会话最后一条消息的 pk（会话为空时为 None），与缓冲区不一致时丢弃缓存。
+        """
+        with self._lock:
+            self._expire()
+            key = (bot_id, session_id)
+            entry = self._sessions.get(key)
+            if entry is not None and entry.last_pk != last_pk:
+                self._discard(key)
+                self._stale += 1
+                entry = None
+            if entry is None or not (entry.complete or (limit is not None and limit <= len(entry.rows))):
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._touch((bot_id, session_id), entry)
+            rows = list(entry.rows)
+        if limit is not None and limit < len(rows):
+            rows = rows[-limit:]
+        return [MessageRecord(*row) for row in rows]
+
+    def append(self, bot_id: str, session_id: str, record: MessageRecord, previous_pk: int | None) -> None:
+        """追加一条刚写入数据库的消息。
+
+        Args:
+            previous_pk: 写入前数据库中该会话最后一条消息的 pk，与缓冲区末尾不一致时
+                说明缺少其他进程写入的消息，丢弃旧的缓冲区后重新开始。
+        """
+        row = (record.pk, record.role, record.raw_content, record.created_at)
+        key = (bot_id, session_id)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and entry.last_pk != previous_pk:
+                self._discard(key)
+                self._stale += 1
+                entry = None
+            if entry is None:
+                entry = self._sessions[key] = _HotSession(self._max_messages)
+            else:
+                self._touch(key, entry)
+            if len(entry.rows) == entry.rows.maxlen:
+                self._resize(entry, -_row_size(entry.rows[0]))
+                entry.complete = False
+            entry.rows.append(row)
+            self._resize(entry, _row_size(row))
+            self._evict()
+
+    def fill(self, bot_id: str, session_id: str, records: list[MessageRecord], *, complete: bool) -> None:
+        """用数据库查询结果（正序的最近若干条）回填会话缓存。"""
+        if len(records) > self._max_messages:
+            records = records[-self._max_messages :]
+            complete = False
+        with self._lock:
+            self._discard((bot_id, session_id))
+            entry = self._sessions[(bot_id, session_id)] = _HotSession(self._max_messages)
+            for r in records:
+                row = (r.pk, r.role, r.raw_content, r.created_at)
+                entry.rows.append(row)
+                self._resize(entry, _row_size(row))
+            entry.complete = complete
+            self._evict()
+
+    def discard(self, bot_id: str, session_id: str) -> None:
+        """移除会话缓存。"""
+        with self._lock:
+            self._discard((bot_id, session_id))
+
+    def clear(self) -> None:
+        """清空全部缓存（例如绕过存储后端批量导入数据之后）。"""
+        with self._lock:
+            self._sessions.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """命中率与内存占用。"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(e.rows) for e in self._sessions.values()),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "stale": self._stale,
+                "evictions": self._evictions,
+            }
+
+    # ── 内部方法（调用方需持有锁）────────────────────
+
+    def _touch(self, key: tuple[str, str], entry: _HotSession) -> None:
+        entry.touched = time.monotonic()
+        self._sessions.move_to_end(key)
+
+    def _resize(self, entry: _HotSession, delta: int) -> None:
+        entry.size += delta
+        self._bytes += delta
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        entry = self._sessions.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and len(self._sessions) > 1:
+            _, entry = self._sessions.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self._ttl
+        while self._sessions:
+            key, entry = next(iter(self._sessions.items()))
+            if entry.touched >= deadline:
+                break
+            self._discard(key)
+            self._evictions += 1
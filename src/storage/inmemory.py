@@ -0,0 +1,255 @@
+"""纯内存存储后端，适用于临时 / 测试 bot 与基准测试，不产生任何磁盘 I/O。
+
+每个会话的消息以原始行保存在定长环形缓冲区中，超出 max_messages 时丢弃最旧的消息；
+每次读取都构造新的 `MessageRecord`，调用方解码或修改内容不会影响已存储的数据。
+记忆与配置保存在字典中。会话统计反映缓冲区中保留的消息。指定 snapshot_path 时启动时从快照恢复，
+并每隔 snapshot_interval 秒（以及 close 时）将全部数据原子地写入该文件。
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from src.history import MessageRecord
+
+if TYPE_CHECKING:
+    from chat_hub_protocol import SessionInfo
+
+    from .base import SessionOrder
+
+
+_Row = tuple[int, str, str, int]
+"""(pk, role, raw_content, created_at)"""
+
+
+def _size(row: _Row) -> int:
+    return len(row[2].encode())
+
+
+class InMemoryBackend:
+    """纯内存存储后端。"""
+
+    def __init__(
+        self,
+        max_messages: int = 1000,
+        snapshot_path: str | None = None,
+        snapshot_interval: float = 60.0,
+    ) -> None:
+        self._max_messages = max_messages
+        self._snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._messages: dict[tuple[str, str], deque[_Row]] = {}
+        self._bytes: dict[tuple[str, str], int] = {}
+        """各会话缓冲区中消息内容的总字节数。"""
+        self._memories: dict[str, dict[str, str]] = {}
+        self._configs: dict[tuple[str, str], dict[str, str]] = {}
+        self._next_pk = itertools.count(1)
+        self._dirty = False
+
+        self._stop = threading.Event()
+        self._snapshot_thread: threading.Thread | None = None
+        if snapshot_path is not None:
+            self.load_snapshot(snapshot_path)
+            if snapshot_interval > 0:
+                self._snapshot_thread = threading.Thread(
+                    target=self._snapshot_loop, args=(snapshot_interval,), name="inmemory-snapshot", daemon=True
+                )
+                self._snapshot_thread.start()
+
+    # ── 消息 ─────────────────────────────────────────
+
+    def add_message(self, bot_id: str, session_id: str, role: str, content: str) -> MessageRecord:
+        """追加一条消息，缓冲区已满时丢弃最旧的一条。"""
+        with self._lock:
+            row = (next(self._next_pk), role, content, int(time.time()))
+            key = (bot_id, session_id)
+            buffer = self._messages.get(key)
+            if buffer is None:
+                buffer = self._messages[key] = deque(maxlen=self._max_messages)
+                self._bytes[key] = 0
+            if len(buffer) == buffer.maxlen:
+                self._bytes[key] -= _size(buffer[0])
+            buffer.append(row)
+            self._bytes[key] += _size(row)
+            self._dirty = True
+        return MessageRecord(*row)
+
+    def message_history(self, bot_id: str, session_id: str, limit: int | None = None) -> list[MessageRecord]:
+        """获取消息记录（正序），limit 为取最近 N 条。"""
+        with self._lock:
+            buffer = self._messages.get((bot_id, session_id))
+            if not buffer or (limit is not None and limit <= 0):
+                return []
+            start = 0 if limit is None else max(len(buffer) - limit, 0)
+            return [MessageRecord(*row) for row in itertools.islice(buffer, start, None)]
+
+    def iter_messages(self, bot_id: str, session_id: str) -> Iterator[MessageRecord]:
+        """按正序逐条读取消息（基于调用时的快照）。"""
+        yield from self.message_history(bot_id, session_id)
+
+    def clear_messages(self, bot_id: str, session_id: str) -> None:
+        """清除会话的所有消息。"""
+        with self._lock:
+            self._messages.pop((bot_id, session_id), None)
+            self._bytes.pop((bot_id, session_id), None)
+            self._dirty = True
+
+    # ── 会话统计 ─────────────────────────────────────
+
+    def session_stats(self, bot_id: str, session_id: str) -> SessionInfo | None:
+        """获取会话统计信息。"""
+        with self._lock:
+            return self._session_info((bot_id, session_id))
+
+    def list_sessions(
+        self,
+        bot_id: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        order: SessionOrder = "last_active",
+        descending: bool = True,
+    ) -> tuple[list[SessionInfo], int]:
+        """分页列出会话。"""
+        with self._lock:
+            sessions = [info for key in self._messages if key[0] == bot_id and (info := self._session_info(key))]
+        field = {"last_active": "last_at", "first_active": "first_at"}.get(order, order)
+        sessions.sort(key=lambda s: s.session_id)
+        sessions.sort(key=lambda s: getattr(s, field), reverse=descending)
+        return sessions[offset : offset + limit], len(sessions)
+
+    def _session_info(self, key: tuple[str, str]) -> SessionInfo | None:
+        from chat_hub_protocol import SessionInfo
+
+        buffer = self._messages.get(key)
+        if not buffer:
+            return None
+        first, last = buffer[0], buffer[-1]
+        return SessionInfo(
+            session_id=key[1],
+            message_count=len(buffer),
+            total_bytes=self._bytes[key],
+            first_pk=first[0],
+            last_pk=last[0],
+            first_at=first[3],
+            last_at=last[3],
+        )
+
+    # ── 长期记忆 ─────────────────────────────────────
+
+    def get_memory(self, bot_id: str, key: str) -> str | None:
+        """获取一条记忆。"""
+        return self._memories.get(bot_id, {}).get(key)
+
+    def set_memory(self, bot_id: str, key: str, value: str) -> None:
+        """设置一条记忆（已存在则覆盖）。"""
+        with self._lock:
+            self._memories.setdefault(bot_id, {})[key] = value
+            self._dirty = True
+
+    def list_memories(self, bot_id: str) -> dict[str, str]:
+        """列出 bot 的所有记忆。"""
+        with self._lock:
+            return dict(self._memories.get(bot_id, {}))
+
+    def delete_memory(self, bot_id: str, key: str) -> None:
+        """删除一条记忆。"""
+        with self._lock:
+            self._memories.get(bot_id, {}).pop(key, None)
+            self._dirty = True
+
+    def clear_memories(self, bot_id: str) -> None:
+        """清除 bot 的所有记忆。"""
+        with self._lock:
+            self._memories.pop(bot_id, None)
+            self._dirty = True
+
+    # ── 会话配置 ─────────────────────────────────────
+
+    def get_config(self, bot_id: str, session_id: str, key: str) -> str | None:
+        """获取配置值。"""
+        return self._configs.get((bot_id, session_id), {}).get(key)
+
+    def set_config(self, bot_id: str, session_id: str, key: str, value: str) -> None:
+        """设置配置值（已存在则覆盖）。"""
+        with self._lock:
+            self._configs.setdefault((bot_id, session_id), {})[key] = value
+            self._dirty = True
+
+    def list_configs(self, bot_id: str, session_id: str) -> dict[str, str]:
+        """列出会话的所有配置。"""
+        with self._lock:
+            return dict(self._configs.get((bot_id, session_id), {}))
+
+    # ── 快照 ─────────────────────────────────────────
+
+    def save_snapshot(self, path: str) -> None:
+        """将全部数据写入 JSON 快照（先写临时文件再替换，保证原子性）。"""
+        with self._lock:
+            data = {
+                "messages": [
+                    [bot_id, session_id, list(buffer)]
+                    for (bot_id, session_id), buffer in self._messages.items()
+                ],
+                "memories": self._memories,
+                "configs": [[bot_id, session_id, values] for (bot_id, session_id), values in self._configs.items()],
+            }
+            self._dirty = False
+            payload = json.dumps(data, ensure_ascii=False)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str) -> None:
+        """从 JSON 快照恢复数据，文件不存在时忽略。"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            max_pk = 0
+            for bot_id, session_id, rows in data["messages"]:
+                buffer = self._messages[(bot_id, session_id)] = deque(maxlen=self._max_messages)
+                for pk, role, content, created_at in rows:
+                    buffer.append((pk, role, content, created_at))
+                    max_pk = max(max_pk, pk)
+                self._bytes[(bot_id, session_id)] = sum(_size(r) for r in buffer)
+            self._memories = data["memories"]
+            self._configs = {(bot_id, session_id): values for bot_id, session_id, values in data["configs"]}
+            self._next_pk = itertools.count(max_pk + 1)
+            self._dirty = False
+
+    def _snapshot_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            if self._dirty and self._snapshot_path is not None:
+                self.save_snapshot(self._snapshot_path)
+
+    # ── 统计与生命周期 ───────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """后端状态。"""
+        with self._lock:
+            return {
+                "backend": "memory",
+                "sessions": len(self._messages),
+                "messages": sum(len(buffer) for buffer in self._messages.values()),
+            }
+
+    def close(self) -> None:
+        """停止定时快照，并在有未保存修改时写出最终快照。"""
+        self._stop.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        if self._dirty and self._snapshot_path is not None:
+            self.save_snapshot(self._snapshot_path)
@@ -0,0 +1,248 @@
+"""SQLite 存储后端，基于 SQLiter 模型持久化到单个数据库文件。
+
+可选的 `HotTier` 在内存中缓存活跃会话的最近消息，命中时读取最近 N 条消息无需扫描 messages 表；
+数据库始终是唯一数据源：每次读取都用 `session_summaries.last_pk`（按唯一索引的单行查询）校验缓存，
+其他进程写入同一数据库后缓存自动失效。消息写入与 `session_summaries` 摘要的增量更新在同一事务中完成，
+会话统计与列表查询无需扫描 messages 表。
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from sqliter import SqliterDB
+
+from src.history import MessageRecord
+from src.models import SessionConfig, SessionSummary, StoredMemory, StoredMessage
+
+from .hot import HotTier
+
+if TYPE_CHECKING:
+    from chat_hub_protocol import SessionInfo
+
+    from .base import SessionOrder
+
+_MESSAGES = StoredMessage.get_table_name()
+_SUMMARIES = SessionSummary.get_table_name()
+
+_SUMMARY_COLUMNS = "session_id, message_count, total_bytes, first_pk, last_pk, first_at, last_at"
+
+_ORDER_COLUMNS = {
+    "last_active": "last_at",
+    "first_active": "first_at",
+    "message_count": "message_count",
+    "total_bytes": "total_bytes",
+}
+
+
+def _session_info(row: tuple[Any, ...]) -> SessionInfo:
+    from chat_hub_protocol import SessionInfo
+
+    return SessionInfo(**dict(zip(_SUMMARY_COLUMNS.split(", "), row, strict=True)))
+
+
+class SqliteBackend:
+    """SQLite 存储后端。"""
+
+    def __init__(self, db: SqliterDB, hot: HotTier | None = None) -> None:
+        self.db = db
+        self.hot = hot
+
+    # ── 消息 ─────────────────────────────────────────
+
+    def add_message(self, bot_id: str, session_id: str, role: str, content: str) -> MessageRecord:
+        """追加一条消息，并在同一事务中更新会话摘要。"""
+        now = int(time.time())
+        size = len(content.encode())
+        conn = self.db.connect()
+        with conn:
+            cursor = conn.execute(
+                f'INSERT INTO "{_MESSAGES}" (bot_id, session_id, role, content, uid, created_at, updated_at) '
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bot_id, session_id, role, content, uuid.uuid4().hex, now, now),
+            )
+            pk = cursor.lastrowid
+            # INSERT 之后已持有写锁，此时读到的即为本条消息之前的最后一条 pk
+            previous_pk = self._last_pk(bot_id, session_id) if self.hot is not None else None
+            conn.execute(
+                f'INSERT INTO "{_SUMMARIES}" (bot_id, session_id, message_count, total_bytes, '
+                "first_pk, last_pk, first_at, last_at, created_at, updated_at) "
+                "VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (bot_id, session_id) DO UPDATE SET "
+                "message_count = message_count + 1, total_bytes = total_bytes + excluded.total_bytes, "
+                "last_pk = excluded.last_pk, last_at = excluded.last_at, updated_at = excluded.updated_at",
+                (bot_id, session_id, size, pk, pk, now, now, now, now),
+            )
+        record = MessageRecord(pk, role, content, now)
+        if self.hot is not None:
+            self.hot.append(bot_id, session_id, record, previous_pk)
+        return record
+
+    def message_history(self, bot_id: str, session_id: str, limit: int | None = None) -> list[MessageRecord]:
+        """获取消息记录（正序），优先从热数据层读取，未命中时查询数据库并回填。"""
+        if limit is not None and limit <= 0:
+            return []
+        if self.hot is None:
+            return self._query_history(bot_id, session_id, limit)
+
+        cached = self.hot.get(bot_id, session_id, limit, self._last_pk(bot_id, session_id))
+        if cached is not None:
+            return cached
+        if limit is None:
+            records = self._query_history(bot_id, session_id, None)
+            self.hot.fill(bot_id, session_id, records, complete=True)
+            return records
+        fetch = max(limit, self.hot.max_messages)
+        records = self._query_history(bot_id, session_id, fetch)
+        self.hot.fill(bot_id, session_id, records, complete=len(records) < fetch)
+        return records[-limit:]
+
+    def _last_pk(self, bot_id: str, session_id: str) -> int | None:
+        """从会话摘要读取最后一条消息的 pk，会话为空时为 None。"""
+        row = (
+            self.db.connect()
+            .execute(f'SELECT last_pk FROM "{_SUMMARIES}" WHERE bot_id = ? AND session_id = ?', (bot_id, session_id))
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def _query_history(self, bot_id: str, session_id: str, limit: int | None) -> list[MessageRecord]:
+        """从数据库读取最近 limit 条消息，limit 通过 SQL 下推。"""
+        if limit is None:
+            return list(self.iter_messages(bot_id, session_id))
+        cursor = self.db.connect().execute(
+            f'SELECT pk, role, content, created_at FROM "{_MESSAGES}" '
+            "WHERE bot_id = ? AND session_id = ? ORDER BY pk DESC LIMIT ?",
+            (bot_id, session_id, limit),
+        )
+        rows = cursor.fetchall()
+        rows.reverse()
+        return [MessageRecord(*row) for row in rows]
+
+    def iter_messages(self, bot_id: str, session_id: str) -> Iterator[MessageRecord]:
+        """按正序逐行读取游标，不一次性加载全部结果（不经过热数据层）。"""
+        cursor = self.db.connect().execute(
+            f'SELECT pk, role, content, created_at FROM "{_MESSAGES}" '
+            "WHERE bot_id = ? AND session_id = ? ORDER BY pk",
+            (bot_id, session_id),
+        )
+        try:
+            for row in cursor:
+                yield MessageRecord(*row)
+        finally:
+            cursor.close()
+
+    def clear_messages(self, bot_id: str, session_id: str) -> None:
+        """清除会话的所有消息及其摘要。"""
+        conn = self.db.connect()
+        with conn:
+            conn.execute(f'DELETE FROM "{_MESSAGES}" WHERE bot_id = ? AND session_id = ?', (bot_id, session_id))
+            conn.execute(f'DELETE FROM "{_SUMMARIES}" WHERE bot_id = ? AND session_id = ?', (bot_id, session_id))
+        if self.hot is not None:
+            self.hot.fill(bot_id, session_id, [], complete=True)
+
+    # ── 会话统计 ─────────────────────────────────────
+
+    def session_stats(self, bot_id: str, session_id: str) -> SessionInfo | None:
+        """从会话摘要读取统计信息。"""
+        row = (
+            self.db.connect()
+            .execute(
+                f'SELECT {_SUMMARY_COLUMNS} FROM "{_SUMMARIES}" WHERE bot_id = ? AND session_id = ?',
+                (bot_id, session_id),
+            )
+            .fetchone()
+        )
+        return None if row is None else _session_info(row)
+
+    def list_sessions(
+        self,
+        bot_id: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        order: SessionOrder = "last_active",
+        descending: bool = True,
+    ) -> tuple[list[SessionInfo], int]:
+        """分页列出会话，排序与计数均基于会话摘要表。"""
+        column = _ORDER_COLUMNS[order]
+        direction = "DESC" if descending else "ASC"
+        conn = self.db.connect()
+        rows = conn.execute(
+            f'SELECT {_SUMMARY_COLUMNS} FROM "{_SUMMARIES}" WHERE bot_id = ? '
+            f"ORDER BY {column} {direction}, session_id LIMIT ? OFFSET ?",
+            (bot_id, limit, offset),
+        ).fetchall()
+        (total,) = conn.execute(f'SELECT COUNT(*) FROM "{_SUMMARIES}" WHERE bot_id = ?', (bot_id,)).fetchone()
+        return [_session_info(row) for row in rows], total
+
+    # ── 长期记忆 ─────────────────────────────────────
+
+    def get_memory(self, bot_id: str, key: str) -> str | None:
+        """获取一条记忆。"""
+        row = self.db.select(StoredMemory).filter(bot_id=bot_id, key=key).fetch_one()
+        return None if row is None else row.value
+
+    def set_memory(self, bot_id: str, key: str, value: str) -> None:
+        """设置一条记忆（已存在则覆盖）。"""
+        existing = self.db.select(StoredMemory).filter(bot_id=bot_id, key=key).fetch_one()
+        if existing is not None:
+            existing.value = value
+            self.db.update(existing)
+        else:
+            self.db.insert(StoredMemory(bot_id=bot_id, key=key, value=value))
+
+    def list_memories(self, bot_id: str) -> dict[str, str]:
+        """列出 bot 的所有记忆。"""
+        rows = self.db.select(StoredMemory).filter(bot_id=bot_id).fetch_all()
+        return {r.key: r.value for r in rows}
+
+    def delete_memory(self, bot_id: str, key: str) -> None:
+        """删除一条记忆。"""
+        self.db.select(StoredMemory).filter(bot_id=bot_id, key=key).delete()
+
+    def clear_memories(self, bot_id: str) -> None:
+        """清除 bot 的所有记忆。"""
+        self.db.select(StoredMemory).filter(bot_id=bot_id).delete()
+
+    # ── 会话配置 ─────────────────────────────────────
+
+    def get_config(self, bot_id: str, session_id: str, key: str) -> str | None:
+        """获取配置值。"""
+        row = self.db.select(SessionConfig).filter(bot_id=bot_id, session_id=session_id, key=key).fetch_one()
+        return None if row is None else row.value
+
+    def set_config(self, bot_id: str, session_id: str, key: str, value: str) -> None:
+        """设置配置值（已存在则覆盖）。"""
+        existing = self.db.select(SessionConfig).filter(bot_id=bot_id, session_id=session_id, key=key).fetch_one()
+        if existing is not None:
+            existing.value = value
+            self.db.update(existing)
+        else:
+            self.db.insert(SessionConfig(bot_id=bot_id, session_id=session_id, key=key, value=value))
+
+    def list_configs(self, bot_id: str, session_id: str) -> dict[str, str]:
+        """列出会话的所有配置。"""
+        rows = self.db.select(SessionConfig).filter(bot_id=bot_id, session_id=session_id).fetch_all()
+        return {r.key: r.value for r in rows}
+
+    # ── 统计与生命周期 ───────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """后端状态，包含热数据层的命中率与内存占用。"""
+        return {
+            "backend": "sqlite",
+            "hot_tier": None if self.hot is None else self.hot.stats(),
+        }
+
+    def invalidate_cache(self) -> None:
+        """丢弃热数据层，在绕过后端直接写入数据库（如批量导入）后调用。"""
+        if self.hot is not None:
+            self.hot.clear()
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        self.db.close()
@@ -0,0 +1,308 @@
+"""会话数据的流式导出与批量导入，用于备份与跨主机迁移。
+
+导出格式为 NDJSON，每行一条记录（不含自增主键 ``pk``）::
+
+    {"table": "messages", "row": {"bot_id": "bot-001", "session_id": "sess-abc", "role": "user", ...}}
+
+导出逐行读取游标，导入按批次在单个事务中写入。离线导入可在导入期间暂时删除二级索引
+（唯一索引用于去重，始终保留）、结束后重建；服务运行期间导入应保留索引，否则并发的查询会退化为全表扫描。
+
+导入是幂等的：memories / session_configs 按键覆盖，messages 按全局唯一的 ``uid`` 去重，
+由数据库的唯一索引判断是否已存在（``INSERT OR IGNORE``）。旧版导出文件中没有 ``uid`` 的消息
+根据 bot_id、session_id、role、created_at、content 生成确定的 uid，因此这类文件中同一秒内
+内容完全相同的多条消息只会保留一条。每批独立提交，导入中途失败时已提交的批次会保留在
+数据库中，修正输入后重新导入同一文件即可补齐剩余数据。
+
+用法::
+
+    with open("bot-001.ndjson.gz", "wb") as f:
+        for chunk in encode_chunks(export_ndjson(db, "bot-001"), compress=True):
+            f.write(chunk)
+
+    decoder = LineDecoder()
+    with BulkImporter(db) as importer, open("bot-001.ndjson.gz", "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            for line in decoder.feed(chunk):
+                importer.add_line(line)
+        for line in decoder.close():
+            importer.add_line(line)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pydantic import ValidationError
+from sqliter import SqliterDB
+from sqliter.model import BaseDBModel
+
+from src.database import rebuild_session_summaries
+from src.models import SessionConfig, StoredMemory, StoredMessage
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+_MODELS: dict[str, type[BaseDBModel]] = {
+    model.get_table_name(): model for model in (StoredMessage, StoredMemory, SessionConfig)
+}
+"""导出 / 导入的数据表；session_summaries 为派生数据，导入后根据 messages 重建。"""
+
+_UPSERT_KEYS: dict[str, tuple[str, ...]] = {
+    "memories": ("bot_id", "key"),
+    "session_configs": ("bot_id", "session_id", "key"),
+}
+"""按键覆盖写入的表；未列出的表（messages）追加，uid 已存在的消息被忽略。"""
+
+
+def _legacy_uid(message: StoredMessage) -> str:
+    """为没有 uid 的旧版导出消息生成确定的 uid，使重复导入同一文件仍然幂等。"""
+    key = json.dumps(
+        [message.bot_id, message.session_id, message.role, message.created_at, message.content],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _columns(model: type[BaseDBModel]) -> list[str]:
+    """导出 / 导入的列，不含自增主键。"""
+    return [name for name in model.model_fields if name != "pk"]
+
+
+# ── 导出 ──────────────────────────────────────────────────
+
+
+def export_ndjson(
+    db: SqliterDB | sqlite3.Connection, bot_id: str, session_id: str | None = None
+) -> Iterator[str]:
+    """逐行导出 bot（或其单个会话）的数据，每次产出一行 NDJSON。
+
+    导出整个 bot 时包含 messages、memories、session_configs；
+    仅导出单个会话时不含按 bot 维度存储的 memories。
+    传入独立的连接时，导出的读事务不与该数据库的其他连接共享。
+    """
+    conn = db if isinstance(db, sqlite3.Connection) else db.connect()
+    for table, model in _MODELS.items():
+        if session_id is None:
+            where, params = "bot_id = ?", (bot_id,)
+        elif model is StoredMemory:
+            continue
+        else:
+            where, params = "bot_id = ? AND session_id = ?", (bot_id, session_id)
+
+        columns = _columns(model)
+        select_list = ", ".join(f'"{c}"' for c in columns)
+        cursor = conn.execute(f'SELECT {select_list} FROM "{table}" WHERE {where} ORDER BY pk', params)
+        try:
+            for row in cursor:
+                record = {"table": table, "row": dict(zip(columns, row, strict=True))}
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        finally:
+            cursor.close()
+
+
+def encode_chunks(lines: Iterable[str], *, compress: bool = False, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """将文本行合并为约 chunk_size 字节的块，可选 gzip 压缩。"""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            chunk = b"".join(buffer)
+            buffer.clear()
+            size = 0
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    tail = b"".join(buffer)
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+# ── 导入 ──────────────────────────────────────────────────
+
+
+class LineDecoder:
+    """将字节块增量拆分为行，首块以 gzip 魔数开头时自动解压。"""
+
+    def __init__(self) -> None:
+        self._decompressor: zlib._Decompress | None = None
+        self._started = False
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """输入一个字节块，返回其中已完整的行。"""
+        if not self._started:
+            self._started = True
+            if chunk.startswith(_GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(wbits=31)
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk)
+        data = self._pending + chunk
+        lines = data.split(b"\n")
+        self._pending = lines.pop()
+        return lines
+
+    def close(self) -> list[bytes]:
+        """结束输入，返回剩余的最后一行（如有）。"""
+        if self._decompressor is not None:
+            self._pending += self._decompressor.flush()
+        tail, self._pending = self._pending, b""
+        return [tail] if tail.strip() else []
+
+
+class BulkImporter:
+    """批量导入 NDJSON 记录。
+
+    作为上下文管理器使用：每 batch_size 条记录在一个事务中写入，退出时写入剩余记录。
+    drop_indexes 为 True 时进入时删除各表的二级索引、退出时重建，只应在服务停止时使用。
+    memories / session_configs 按键覆盖已有记录；messages 追加并重新分配主键，
+    uid 已存在的消息由数据库忽略并计入 skipped，退出时重建涉及 bot 的会话摘要。
+    """
+
+    def __init__(self, db: SqliterDB, batch_size: int = 5000, *, drop_indexes: bool = False) -> None:
+        self._db = db
+        self._batch_size = batch_size
+        self._drop = drop_indexes
+        self._appends: dict[str, list[tuple[Any, ...]]] = {}
+        self._upserts: dict[str, dict[tuple[Any, ...], tuple[Any, ...]]] = {}
+        self._pending_count = 0
+        self._dropped_indexes: list[str] = []
+        self._message_bots: set[str] = set()
+        self.counts: dict[str, int] = dict.fromkeys(_MODELS, 0)
+        """各表已写入的记录数。"""
+        self.skipped = 0
+        """因 uid 已存在而跳过的消息数。"""
+
+    def __enter__(self) -> BulkImporter:
+        if self._drop:
+            self._drop_indexes()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self._appends.clear()
+            self._upserts.clear()
+            self._pending_count = 0
+            self._rebuild_indexes()
+            for bot_id in self._message_bots:
+                rebuild_session_summaries(self._db, bot_id)
+
+    def add_line(self, line: str | bytes) -> None:
+        """解析并加入一行 NDJSON，空行会被忽略。"""
+        if not line.strip():
+            return
+        record = json.loads(line)
+        try:
+            table, row = record["table"], record["row"]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"无效的导入记录: {line!r}") from e
+        self.add(table, row)
+
+    def add(self, table: str, row: dict[str, Any]) -> None:
+        """校验并加入一条记录，累计满一批时自动写入。"""
+        model = _MODELS.get(table)
+        if model is None:
+            raise ValueError(f"未知数据表: {table}")
+        if not isinstance(row, dict):
+            raise ValueError(f"{table} 记录必须是对象: {row!r}")
+
+        now = int(time.time())
+        try:
+            record = model.model_validate({"created_at": now, "updated_at": now, **row})
+        except ValidationError as e:
+            raise ValueError(f"无效的 {table} 记录: {e}") from e
+        if isinstance(record, StoredMessage) and record.uid is None:
+            record.uid = _legacy_uid(record)
+        values = tuple(getattr(record, c) for c in _columns(model))
+
+        keys = _UPSERT_KEYS.get(table)
+        if keys is None:
+            self._appends.setdefault(table, []).append(values)
+            self._message_bots.add(record.bot_id)
+        else:
+            self._upserts.setdefault(table, {})[tuple(getattr(record, k) for k in keys)] = values
+        self._pending_count += 1
+        if self._pending_count >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """在一个事务中写入所有待写记录。"""
+        if not self._pending_count:
+            return
+        conn = self._db.connect()
+        written: dict[str, int] = {}
+        try:
+            for table, upserts in self._upserts.items():
+                where = " AND ".join(f'"{k}" = ?' for k in _UPSERT_KEYS[table])
+                conn.executemany(f'DELETE FROM "{table}" WHERE {where}', upserts.keys())
+                written[table] = self._insert(conn, table, upserts.values())
+            for table, appends in self._appends.items():
+                written[table] = self._insert(conn, table, appends, ignore=True)
+                self.skipped += len(appends) - written[table]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        for table, count in written.items():
+            self.counts[table] += count
+        self._appends.clear()
+        self._upserts.clear()
+        self._pending_count = 0
+
+    @staticmethod
+    def _insert(
+        conn: sqlite3.Connection, table: str, rows: Iterable[tuple[Any, ...]], *, ignore: bool = False
+    ) -> int:
+        """写入记录，返回实际插入的行数；ignore 为 True 时跳过违反唯一约束的记录。"""
+        columns = _columns(_MODELS[table])
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        verb = "INSERT OR IGNORE" if ignore else "INSERT"
+        cursor = conn.executemany(f'{verb} INTO "{table}" ({column_list}) VALUES ({placeholders})', rows)
+        return cursor.rowcount
+
+    def _drop_indexes(self) -> None:
+        conn = self._db.connect()
+        placeholders = ", ".join("?" for _ in _MODELS)
+        rows = conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            f"WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders}) "
+            "AND sql NOT LIKE 'CREATE UNIQUE INDEX%'",
+            tuple(_MODELS),
+        ).fetchall()
+        for name, sql in rows:
+            conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+            self._dropped_indexes.append(sql)
+        conn.commit()
+
+    def _rebuild_indexes(self) -> None:
+        conn = self._db.connect()
+        for sql in self._dropped_indexes:
+            conn.execute(sql)
+        conn.commit()
+        self._dropped_indexes.clear()
+
+
+def import_ndjson(
+    db: SqliterDB, lines: Iterable[str | bytes], batch_size: int = 5000, *, drop_indexes: bool = False
+) -> dict[str, int]:
+    """批量导入 NDJSON 行，返回各表写入的记录数。"""
+    with BulkImporter(db, batch_size, drop_indexes=drop_indexes) as importer:
+        for line in lines:
+            importer.add_line(line)
+    return importer.counts
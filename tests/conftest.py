@@ -0,0 +1,12 @@
+"""测试公共配置。
+
+`src.models.settings` 在导入时读取环境变量，因此在导入任何 `src` 模块之前
+将数据目录指向临时目录，避免测试写入仓库下的 data/。
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+
+os.environ.setdefault("CHAT_HUB_DATA_DIR", tempfile.mkdtemp(prefix="chat-hub-test-"))
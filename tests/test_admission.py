@@ -0,0 +1,117 @@
+"""准入控制测试。"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.admission import AdmissionController, ConcurrencyLimiter, OverloadedError, RateLimiter
+
+
+def _controller(bot_burst: int = 10, session_burst: int = 5) -> AdmissionController:
+    # 补充速率极低，测试期间令牌数只取决于 burst
+    return AdmissionController(
+        RateLimiter(0.001, bot_burst),
+        RateLimiter(0.001, session_burst),
+        ConcurrencyLimiter(0),
+    )
+
+
+async def _try_admit(admission: AdmissionController, bot_id: str, session_id: str) -> bool:
+    try:
+        async with admission.admit(bot_id, session_id):
+            return True
+    except OverloadedError:
+        return False
+
+
+def test_flooding_session_does_not_starve_other_sessions() -> None:
+    admission = _controller(bot_burst=10, session_burst=5)
+
+    async def run() -> tuple[int, bool]:
+        admitted = sum([await _try_admit(admission, "b", "noisy") for _ in range(100)])
+        return admitted, await _try_admit(admission, "b", "quiet")
+
+    admitted, quiet = asyncio.run(run())
+    assert admitted == 5
+    assert quiet
+
+
+def test_bot_limit_applies_across_sessions() -> None:
+    admission = _controller(bot_burst=3, session_burst=5)
+
+    async def run() -> list[bool]:
+        return [await _try_admit(admission, "b", f"s{i}") for i in range(4)]
+
+    assert asyncio.run(run()) == [True, True, True, False]
+
+
+def test_rejection_reports_retry_after() -> None:
+    admission = _controller(bot_burst=10, session_burst=1)
+
+    async def run() -> None:
+        async with admission.admit("b", "s"):
+            pass
+        async with admission.admit("b", "s"):
+            pass
+
+    with pytest.raises(OverloadedError) as exc_info:
+        asyncio.run(run())
+    assert "会话 s" in exc_info.value.reason
+    assert exc_info.value.retry_after > 0
+
+
+# ── ConcurrencyLimiter ────────────────────────────────────
+
+
+async def _hold(limiter: ConcurrencyLimiter, release: asyncio.Event) -> None:
+    async with limiter.acquire():
+        await release.wait()
+
+
+def test_full_queue_rejects_immediately() -> None:
+    limiter = ConcurrencyLimiter(1, max_queue=1, timeout=5.0)
+
+    async def run() -> tuple[str, int]:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, release))
+        queued = asyncio.create_task(_hold(limiter, release))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+
+        with pytest.raises(OverloadedError) as exc_info:
+            async with limiter.acquire():
+                pass
+        # 排队中的请求在名额释放后获得处理
+        release.set()
+        await asyncio.gather(holder, queued)
+        return exc_info.value.reason, limiter.waiting
+
+    reason, waiting = asyncio.run(run())
+    assert "队列已满" in reason
+    assert waiting == 0
+
+
+def test_queued_request_times_out() -> None:
+    limiter = ConcurrencyLimiter(1, max_queue=1, timeout=0.01)
+
+    async def run() -> tuple[str, int]:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError) as exc_info:
+            async with limiter.acquire():
+                pass
+        waiting = limiter.waiting
+        release.set()
+        await holder
+        # 超时的请求不占用名额
+        async with limiter.acquire():
+            pass
+        return exc_info.value.reason, waiting
+
+    reason, waiting = asyncio.run(run())
+    assert "排队超时" in reason
+    assert waiting == 0
@@ -0,0 +1,102 @@
+"""接口冒烟测试。"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from chat_hub_protocol import (
+    ChatEvent,
+    ChatPayload,
+    CommandPayload,
+    CommandResult,
+    EventType,
+    Message,
+    Role,
+    SessionStatsCommand,
+)
+from fastapi.testclient import TestClient
+
+
+def test_chat_roundtrip() -> None:
+    from src.api import app
+
+    payload = ChatPayload(bot_id="bot-smoke", session_id="sess-1", message=Message.text(Role.USER, "你好"))
+    with TestClient(app) as client:
+        resp = client.post("/chat", json=payload.model_dump(mode="json"))
+        command = CommandPayload(bot_id="bot-smoke", session_id="sess-1", command=SessionStatsCommand())
+        stats = CommandResult.model_validate(client.post("/command", json=command.model_dump(mode="json")).json())
+
+    assert resp.status_code == 200
+    event = ChatEvent.model_validate(resp.json())
+    assert event.event == EventType.MESSAGE
+    assert event.bot_id == "bot-smoke"
+    assert event.session_id == "sess-1"
+    assert stats.success
+    assert stats.data is not None
+    assert stats.data["session"]["message_count"] == 1
+
+
+@pytest.fixture
+def admin_token(monkeypatch: pytest.MonkeyPatch) -> str:
+    from src.models import settings
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    return "secret"
+
+
+def test_admin_endpoints_require_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.api import app
+    from src.models import settings
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(settings, "admin_token", None)
+        assert client.get("/admin/stats").status_code == 403
+        assert client.get("/admin/export", params={"bot_id": "b"}).status_code == 403
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        assert client.post("/admin/import", content=b"").status_code == 401
+        assert client.get("/admin/jobs", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/admin/stats", headers={"Authorization": "Bearer secret"}).status_code == 200
+
+
+def test_admin_import_is_idempotent(admin_token: str) -> None:
+    from src.api import app
+
+    row = {"bot_id": "bot-import", "session_id": "s", "role": "user", "content": "[]", "created_at": 1700000000}
+    body = (json.dumps({"table": "messages", "row": row}) + "\n").encode()
+    with TestClient(app) as client:
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = client.post("/admin/import", content=body, headers=headers).json()
+        second = client.post("/admin/import", content=body, headers=headers).json()
+
+    assert (first["messages"], first["skipped"]) == (1, 0)
+    assert (second["messages"], second["skipped"]) == (0, 1)
+
+
+def test_admin_export_import_roundtrip(admin_token: str) -> None:
+    from src.api import app
+
+    payload = ChatPayload(bot_id="bot-export", session_id="s", message=Message.text(Role.USER, "你好"))
+    with TestClient(app) as client:
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.post("/chat", json=payload.model_dump(mode="json"))
+        exported = client.get("/admin/export", params={"bot_id": "bot-export", "compress": True}, headers=headers)
+        imported = client.post("/admin/import", content=exported.content, headers=headers).json()
+
+    assert exported.status_code == 200
+    assert exported.content.startswith(b"\x1f\x8b")
+    assert imported["messages"] == 0
+    assert imported["skipped"] >= 1
+
+
+def test_admin_import_rejects_invalid_rows(admin_token: str) -> None:
+    from src.api import app
+
+    with TestClient(app) as client:
+        resp = client.post(
+            "/admin/import",
+            content=b'{"table": "messages", "row": []}\n',
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+    assert resp.status_code == 400
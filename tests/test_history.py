@@ -0,0 +1,103 @@
+"""会话历史视图测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from chat_hub_protocol import TextSegment
+from sqliter import SqliterDB
+
+from src.database import open_database
+from src.history import MessageRecord
+from src.session import SessionScope
+from src.storage import SqliteBackend
+
+
+def _text(text: str) -> list[dict[str, str]]:
+    return [{"type": "text", "text": text}]
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> SqliterDB:
+    return open_database(str(tmp_path / "history.db"))
+
+
+@pytest.fixture
+def session(db: SqliterDB) -> SessionScope:
+    scope = SessionScope(SqliteBackend(db), "b", "s")
+    for i in range(200):
+        scope.messages.add("user" if i % 2 == 0 else "assistant", _text(f"m{i}"))
+    return scope
+
+
+# ── MessageRecord ─────────────────────────────────────────
+
+
+def test_content_is_decoded_on_first_access() -> None:
+    # 构造时不解析 JSON，只读取 role 等字段的调用方不会遇到解码错误
+    record = MessageRecord(1, "user", "not json", 0)
+    assert (record.pk, record.role, record.raw_content) == (1, "user", "not json")
+    with pytest.raises(json.JSONDecodeError):
+        _ = record.content
+
+
+def test_decoded_content_is_cached() -> None:
+    record = MessageRecord(1, "user", json.dumps(_text("hi")), 0)
+    assert record.content == _text("hi")
+    assert record.content is record.content
+    assert record.to_dict() == {"pk": 1, "role": "user", "content": _text("hi"), "created_at": 0}
+
+
+def test_segments_are_validated_models() -> None:
+    record = MessageRecord(1, "user", json.dumps(_text("hi")), 0)
+    assert record.segments == [TextSegment(text="hi")]
+    assert record.segments is record.segments
+
+
+# ── MessageAccessor ───────────────────────────────────────
+
+
+def test_history_limit_is_pushed_into_sql(db: SqliterDB, session: SessionScope) -> None:
+    statements: list[str] = []
+    db.connect().set_trace_callback(statements.append)
+    try:
+        records = session.messages.history(limit=3)
+    finally:
+        db.connect().set_trace_callback(None)
+
+    assert [r.content for r in records] == [_text("m197"), _text("m198"), _text("m199")]
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1
+    assert "LIMIT" in selects[0]
+
+
+def test_history_without_limit_returns_all(session: SessionScope) -> None:
+    records = session.messages.history()
+    assert len(records) == 200
+    assert [r.pk for r in records] == sorted(r.pk for r in records)
+    assert session.messages.history(limit=0) == []
+
+
+def test_iter_streams_rows(db: SqliterDB, session: SessionScope) -> None:
+    steps = 0
+
+    def count() -> int:
+        nonlocal steps
+        steps += 1
+        return 0
+
+    db.connect().set_progress_handler(count, 1)
+    try:
+        rows = session.messages.iter()
+        first = next(rows)
+        after_first = steps
+        rest = list(rows)
+    finally:
+        db.connect().set_progress_handler(None, 1)
+
+    assert first.content == _text("m0")
+    assert len(rest) == 199
+    # 取第一条时只执行了查询的开头部分，其余行在迭代时才逐行读取
+    assert after_first * 10 < steps
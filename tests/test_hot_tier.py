@@ -0,0 +1,151 @@
+"""热数据层测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.database import open_database
+from src.history import MessageRecord
+from src.storage import HotTier, SqliteBackend
+
+
+def _record(pk: int, text: str = "x") -> MessageRecord:
+    return MessageRecord(pk, "user", json.dumps(text), 0)
+
+
+def _fill(hot: HotTier, session_id: str, pks: list[int], *, complete: bool = True) -> None:
+    hot.fill("b", session_id, [_record(pk) for pk in pks], complete=complete)
+
+
+def _pks(records: list[MessageRecord] | None) -> list[int] | None:
+    return None if records is None else [r.pk for r in records]
+
+
+# ── HotTier ───────────────────────────────────────────────
+
+
+def test_hit_and_miss() -> None:
+    hot = HotTier(max_messages=10)
+    assert hot.get("b", "s", 5, None) is None
+
+    _fill(hot, "s", [1, 2, 3], complete=False)
+    assert _pks(hot.get("b", "s", 2, 3)) == [2, 3]
+    # 不完整的缓冲区无法满足超出其长度的请求
+    assert hot.get("b", "s", 5, 3) is None
+    assert hot.get("b", "s", None, 3) is None
+
+    stats = hot.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+
+
+def test_complete_session_serves_any_limit() -> None:
+    hot = HotTier(max_messages=10)
+    _fill(hot, "s", [1, 2])
+    assert _pks(hot.get("b", "s", None, 2)) == [1, 2]
+    assert _pks(hot.get("b", "s", 50, 2)) == [1, 2]
+
+
+def test_append_extends_buffer() -> None:
+    hot = HotTier(max_messages=3)
+    _fill(hot, "s", [1, 2])
+    hot.append("b", "s", _record(3), previous_pk=2)
+    assert _pks(hot.get("b", "s", None, 3)) == [1, 2, 3]
+
+    # 超出 max_messages 后丢弃最旧的消息，不再完整
+    hot.append("b", "s", _record(4), previous_pk=3)
+    assert _pks(hot.get("b", "s", 3, 4)) == [2, 3, 4]
+    assert hot.get("b", "s", None, 4) is None
+
+
+def test_stale_entry_is_discarded() -> None:
+    hot = HotTier(max_messages=10)
+    _fill(hot, "s", [1, 2])
+    assert hot.get("b", "s", 2, 5) is None
+    assert hot.stats()["stale"] == 1
+    assert hot.stats()["sessions"] == 0
+
+
+def test_append_after_gap_restarts_buffer() -> None:
+    hot = HotTier(max_messages=10)
+    _fill(hot, "s", [1, 2])
+    hot.append("b", "s", _record(5), previous_pk=4)
+    assert _pks(hot.get("b", "s", 1, 5)) == [5]
+    assert hot.get("b", "s", 2, 5) is None
+
+
+def test_evicts_least_recently_used_over_budget() -> None:
+    hot = HotTier(max_messages=10, max_bytes=1)
+    _fill(hot, "old", [1])
+    _fill(hot, "new", [2])
+    assert hot.get("b", "old", 1, 1) is None
+    assert _pks(hot.get("b", "new", 1, 2)) == [2]
+    assert hot.stats()["evictions"] == 1
+
+
+def test_expires_idle_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("src.storage.hot.time.monotonic", lambda: now)
+    hot = HotTier(max_messages=10, ttl=60)
+    _fill(hot, "s", [1])
+    now += 30
+    assert _pks(hot.get("b", "s", 1, 1)) == [1]
+    now += 61
+    assert hot.get("b", "s", 1, 1) is None
+
+
+def test_clear_and_discard() -> None:
+    hot = HotTier(max_messages=10)
+    _fill(hot, "a", [1])
+    _fill(hot, "c", [2])
+    hot.discard("b", "a")
+    assert hot.get("b", "a", 1, 1) is None
+    hot.clear()
+    assert hot.get("b", "c", 1, 2) is None
+    assert hot.stats()["bytes"] == 0
+
+
+# ── SqliteBackend ─────────────────────────────────────────
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    return str(tmp_path / "chat_hub.db")
+
+
+def _backend(path: str) -> SqliteBackend:
+    return SqliteBackend(open_database(path), HotTier(max_messages=10))
+
+
+def _contents(records: list[MessageRecord]) -> list[str]:
+    return [r.content for r in records]
+
+
+def test_backend_serves_history_from_hot_tier(db_path: str) -> None:
+    backend = _backend(db_path)
+    for i in range(3):
+        backend.add_message("b", "s", "user", json.dumps(str(i)))
+    assert _contents(backend.message_history("b", "s", 2)) == ["1", "2"]
+    assert backend.hot is not None and backend.hot.stats()["hits"] == 1
+
+    backend.clear_messages("b", "s")
+    assert backend.message_history("b", "s", 2) == []
+
+
+def test_backend_sees_writes_from_other_process(db_path: str) -> None:
+    a, b = _backend(db_path), _backend(db_path)
+    a.add_message("b", "s", "user", json.dumps("9"))
+    assert _contents(a.message_history("b", "s", 5)) == ["9"]
+
+    b.add_message("b", "s", "user", json.dumps("10"))
+    assert _contents(a.message_history("b", "s", 5)) == ["9", "10"]
+
+    # a 的缓冲区缺少 b 写入的消息时，追加不应产生有缺口的历史
+    b.add_message("b", "s", "user", json.dumps("11"))
+    a.add_message("b", "s", "user", json.dumps("12"))
+    assert _contents(a.message_history("b", "s", 5)) == ["9", "10", "11", "12"]
+
+    b.clear_messages("b", "s")
+    assert a.message_history("b", "s", 5) == []
@@ -0,0 +1,113 @@
+"""后台任务队列测试。"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.jobs import Job, JobQueue
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "jobs.db")
+
+
+def _queue(path: str, **kwargs: float) -> tuple[JobQueue, list[Job]]:
+    queue = JobQueue(path, workers=0, backoff=0, **kwargs)  # type: ignore[arg-type]
+    done: list[Job] = []
+    queue.handler("task")(done.append)
+    return queue, done
+
+
+def test_runs_jobs_in_session_order(path: str) -> None:
+    queue, done = _queue(path)
+    for i in range(3):
+        queue.enqueue("task", "b", "s", {"i": i})
+    queue.enqueue("other", "b", "s")  # 未注册的类型被忽略
+
+    assert queue.run_pending() == 3
+    assert [job.payload["i"] for job in done] == [0, 1, 2]
+    assert queue.stats()["pending"] == 0
+
+
+def test_retries_then_fails(path: str) -> None:
+    queue = JobQueue(path, workers=0, max_attempts=2, backoff=0)
+    attempts: list[int] = []
+
+    @queue.handler("task")
+    def fail(job: Job) -> None:
+        attempts.append(job.attempts)
+        raise RuntimeError("boom")
+
+    queue.enqueue("task", "b", "s")
+    queue.run_pending()
+    assert attempts == [1, 2]
+    assert queue.stats()["failed"] == 1
+
+
+def test_running_job_of_live_owner_is_not_requeued(path: str) -> None:
+    first, _ = _queue(path, lease=60)
+    first.enqueue("task", "b", "s")
+    assert first._claim() is not None
+
+    # 另一个进程启动时不应重新执行 first 正在执行的任务
+    second, _ = _queue(path, lease=60)
+    assert second.run_pending() == 0
+    assert second.stats()["running"] == 1
+
+
+def test_expired_lease_is_requeued(path: str) -> None:
+    first, _ = _queue(path, lease=-1)
+    first.enqueue("task", "b", "s")
+    stale = first._claim()
+    assert stale is not None
+
+    second, done = _queue(path)
+    assert second.run_pending() == 1
+    assert done[0].attempts == 2
+
+
+def test_late_completion_keeps_reclaimed_job(path: str) -> None:
+    first, _ = _queue(path, lease=-1)
+    first.enqueue("task", "b", "s")
+    stale = first._claim()
+    assert stale is not None
+
+    second, _ = _queue(path)
+    assert second._claim() is not None
+    # 原持有者迟到的完成不会删除已被重新领取的任务
+    first._run(stale)
+    assert second.stats()["running"] == 1
+
+
+def test_upgrades_v1_schema(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE "jobs" ("pk" INTEGER PRIMARY KEY AUTOINCREMENT, "created_at" INTEGER, "updated_at" INTEGER, '
+        '"kind" TEXT, "bot_id" TEXT, "session_id" TEXT, "payload" TEXT, "status" TEXT, "attempts" INTEGER, '
+        '"run_at" REAL, "last_error" TEXT)'
+    )
+    conn.execute(
+        "INSERT INTO jobs (kind, bot_id, session_id, payload, status, attempts, run_at, last_error) "
+        "VALUES ('task', 'b', 's', '{}', 'pending', 0, 0, '')"
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    queue, done = _queue(path)
+    assert queue.run_pending() == 1
+    assert len(done) == 1
+
+
+def test_idle_without_handlers(path: str) -> None:
+    queue = JobQueue(path, workers=2)
+    queue.start()
+    assert queue.enqueue("task", "b", "s") is None
+    assert queue.stats()["workers"] == 0
+    queue.close()
+    # 没有处理函数时不启动线程，也不创建数据库文件
+    assert not Path(path).exists()
@@ -0,0 +1,26 @@
+"""协议包导出测试。"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import chat_hub_protocol
+
+
+def test_all_matches_lazy_exports() -> None:
+    assert sorted(chat_hub_protocol.__all__) == sorted(chat_hub_protocol._EXPORTS)
+    for name in chat_hub_protocol.__all__:
+        assert getattr(chat_hub_protocol, name) is not None
+
+
+def test_chat_stays_bound_to_client_function() -> None:
+    from chat_hub_protocol import ChatPayload  # noqa: F401  触发 chat 子模块导入
+
+    assert callable(chat_hub_protocol.chat)
+
+
+def test_import_does_not_load_pydantic() -> None:
+    code = "import sys, chat_hub_protocol; print('pydantic' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,30 @@
+"""配置校验测试。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.settings import Settings
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"bot_rate_burst": 0},
+        {"session_rate_burst": 0},
+        {"bot_rate_limit": -1},
+        {"memory_max_messages": 0},
+        {"hot_tier_messages": 0},
+    ],
+)
+def test_rejects_invalid_values(overrides: dict[str, Any]) -> None:
+    with pytest.raises(ValidationError):
+        Settings(**overrides)
+
+
+def test_zero_burst_allowed_when_rate_limit_disabled() -> None:
+    settings = Settings(bot_rate_limit=0, bot_rate_burst=0, session_rate_limit=0, session_rate_burst=0)
+    assert settings.bot_rate_burst == 0
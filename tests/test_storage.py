@@ -0,0 +1,227 @@
+"""存储后端测试。"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from chat_hub_protocol import SessionInfo
+
+from src.database import open_database
+from src.models.settings import Settings
+from src.session import SessionScope
+from src.storage import HotTier, InMemoryBackend, SqliteBackend, StorageBackend, create_backend
+
+
+def _text(text: str) -> list[dict[str, str]]:
+    return [{"type": "text", "text": text}]
+
+
+def _summary(info: SessionInfo | None) -> tuple[int, int, float, float] | None:
+    """(消息数, 字节数, 首条时间戳, 末条时间戳)。"""
+    if info is None:
+        return None
+    return info.message_count, info.total_bytes, info.first_at.timestamp(), info.last_at.timestamp()
+
+
+@pytest.fixture(params=["sqlite", "sqlite+hot", "memory"])
+def storage(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[StorageBackend]:
+    backend: StorageBackend
+    match request.param:
+        case "sqlite":
+            backend = SqliteBackend(open_database(str(tmp_path / "chat_hub.db")))
+        case "sqlite+hot":
+            backend = SqliteBackend(open_database(str(tmp_path / "chat_hub.db")), HotTier(max_messages=10))
+        case _:
+            backend = InMemoryBackend()
+    yield backend
+    backend.close()
+
+
+# ── 各引擎的共同行为 ──────────────────────────────────────
+
+
+def test_messages(storage: StorageBackend) -> None:
+    session = SessionScope(storage, "b", "s")
+    for i in range(5):
+        session.messages.add("user", _text(str(i)))
+
+    assert [m["content"][0]["text"] for m in session.messages.list()] == ["0", "1", "2", "3", "4"]
+    assert [r.content[0]["text"] for r in session.messages.history(2)] == ["3", "4"]
+    assert [r.content[0]["text"] for r in session.messages.iter()] == ["0", "1", "2", "3", "4"]
+    assert session.messages.history(0) == []
+
+    # 其他会话互不影响
+    assert SessionScope(storage, "b", "other").messages.list() == []
+
+    session.messages.clear()
+    assert session.messages.list() == []
+
+
+def test_returned_records_do_not_alias_storage(storage: StorageBackend) -> None:
+    session = SessionScope(storage, "b", "s")
+    session.messages.add("user", _text("original"))
+
+    session.messages.list()[0]["content"][0]["text"] = "MUTATED"
+    session.messages.history()[0].content.clear()
+
+    assert session.messages.list()[0]["content"][0]["text"] == "original"
+
+
+def test_memories_and_configs(storage: StorageBackend) -> None:
+    session = SessionScope(storage, "b", "s")
+    session.memory.set("name", "Alice")
+    session.memory.set("name", "Bob")
+    session.memory.set("age", 3)
+    assert session.memory.get("name") == "Bob"
+    assert session.memory.list_all() == {"name": "Bob", "age": 3}
+    session.memory.delete("age")
+    assert session.memory.get("age", default=0) == 0
+    session.memory.clear()
+    assert session.memory.list_all() == {}
+
+    session.config.set("context_length", 30)
+    assert session.config.get("context_length") == 30
+    assert SessionScope(storage, "b", "other").config.get("context_length", default=20) == 20
+
+
+# ── 内存引擎 ──────────────────────────────────────────────
+
+
+def test_memory_ring_buffer_drops_oldest() -> None:
+    backend = InMemoryBackend(max_messages=3)
+    for i in range(5):
+        backend.add_message("b", "s", "user", json.dumps(str(i)))
+
+    assert [r.content for r in backend.message_history("b", "s")] == ["2", "3", "4"]
+    info = backend.session_stats("b", "s")
+    assert info is not None
+    assert (info.message_count, info.total_bytes, info.first_pk) == (3, 9, 3)
+
+
+def test_memory_snapshot_roundtrip(tmp_path: Path) -> None:
+    path = str(tmp_path / "snapshot.json")
+    backend = InMemoryBackend(snapshot_path=path, snapshot_interval=0)
+    backend.add_message("b", "s", "user", json.dumps("hi"))
+    backend.set_memory("b", "name", json.dumps("Alice"))
+    backend.set_config("b", "s", "context_length", "20")
+    backend.close()
+
+    restored = InMemoryBackend(snapshot_path=path, snapshot_interval=0)
+    assert [(r.pk, r.content) for r in restored.message_history("b", "s")] == [(1, "hi")]
+    assert restored.get_memory("b", "name") == json.dumps("Alice")
+    assert restored.get_config("b", "s", "context_length") == "20"
+    # pk 从快照中的最大值继续分配
+    assert restored.add_message("b", "s", "user", json.dumps("again")).pk == 2
+    assert restored.session_stats("b", "s").total_bytes == len('"hi"') + len('"again"')  # type: ignore[union-attr]
+
+
+def test_memory_snapshot_replace_is_atomic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "snapshot.json"
+    backend = InMemoryBackend()
+    backend.add_message("b", "s", "user", json.dumps("first"))
+    backend.save_snapshot(str(path))
+    original = path.read_text(encoding="utf-8")
+
+    def fail(*_: object) -> None:
+        raise OSError("disk full")
+
+    backend.add_message("b", "s", "user", json.dumps("second"))
+    monkeypatch.setattr("src.storage.inmemory.os.replace", fail)
+    with pytest.raises(OSError):
+        backend.save_snapshot(str(path))
+    assert path.read_text(encoding="utf-8") == original
+
+
+def test_memory_snapshot_missing_file_is_ignored(tmp_path: Path) -> None:
+    backend = InMemoryBackend(snapshot_path=str(tmp_path / "missing.json"), snapshot_interval=0)
+    assert backend.message_history("b", "s") == []
+    backend.close()
+    # 没有修改时关闭不写快照
+    assert not (tmp_path / "missing.json").exists()
+
+
+def test_session_stats_and_listing(storage: StorageBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000
+    monkeypatch.setattr(time, "time", lambda: now)
+    sizes: dict[str, int] = {}
+    # s1 最早开始、最后活跃；s3 消息最多
+    for session_id, at in [("s1", 1000), ("s2", 1001), ("s3", 1002), ("s3", 1003), ("s3", 1004), ("s1", 1006)]:
+        now = at
+        content = _text(f"{session_id}@{at}")
+        SessionScope(storage, "b", session_id).messages.add("user", content)
+        sizes[session_id] = sizes.get(session_id, 0) + len(json.dumps(content, ensure_ascii=False).encode())
+    SessionScope(storage, "other", "s1").messages.add("user", _text("x"))
+
+    assert _summary(storage.session_stats("b", "s1")) == (2, sizes["s1"], 1000, 1006)
+    assert storage.session_stats("b", "missing") is None
+
+    def ids(**kwargs: object) -> tuple[list[str], int]:
+        sessions, total = storage.list_sessions("b", **kwargs)  # type: ignore[arg-type]
+        return [s.session_id for s in sessions], total
+
+    assert ids() == (["s1", "s3", "s2"], 3)
+    assert ids(order="first_active", descending=False) == (["s1", "s2", "s3"], 3)
+    assert ids(order="message_count") == (["s3", "s1", "s2"], 3)
+    assert ids(order="total_bytes")[0][0] == "s3"
+    assert ids(offset=1, limit=1) == (["s3"], 3)
+    assert ids(offset=5) == ([], 3)
+
+
+def test_clear_removes_session_summary(storage: StorageBackend) -> None:
+    for session_id in ("s1", "s2"):
+        SessionScope(storage, "b", session_id).messages.add("user", _text("hi"))
+
+    SessionScope(storage, "b", "s1").messages.clear()
+    assert storage.session_stats("b", "s1") is None
+    sessions, total = storage.list_sessions("b")
+    assert ([s.session_id for s in sessions], total) == (["s2"], 1)
+
+
+# ── SQLite 结构升级 ───────────────────────────────────────
+
+
+def test_upgrade_backfills_session_summaries(tmp_path: Path) -> None:
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE messages (pk INTEGER PRIMARY KEY AUTOINCREMENT, created_at INTEGER, updated_at INTEGER, "
+        "bot_id TEXT, session_id TEXT, role TEXT, content TEXT);"
+        "INSERT INTO messages (created_at, updated_at, bot_id, session_id, role, content) "
+        "VALUES (10, 10, 'b', 's1', 'user', 'ab'), (20, 20, 'b', 's1', 'assistant', 'cde'), "
+        "(15, 15, 'b', 's2', 'user', 'f');"
+    )
+    conn.close()
+
+    backend = SqliteBackend(open_database(path))
+    assert _summary(backend.session_stats("b", "s1")) == (2, 5, 10, 20)
+    sessions, total = backend.list_sessions("b")
+    assert ([s.session_id for s in sessions], total) == (["s1", "s2"], 2)
+
+    # 升级后新写入的消息继续增量维护摘要
+    backend.add_message("b", "s2", "user", "gh")
+    assert backend.session_stats("b", "s2").message_count == 2  # type: ignore[union-attr]
+    backend.close()
+
+
+# ── create_backend ────────────────────────────────────────
+
+
+def test_create_backend_selects_engine(tmp_path: Path) -> None:
+    memory = create_backend(Settings(storage_backend="memory"))
+    assert isinstance(memory, InMemoryBackend)
+    memory.close()
+
+    sqlite = create_backend(Settings(storage_backend="sqlite", data_dir=str(tmp_path), hot_tier_enabled=False))
+    assert isinstance(sqlite, SqliteBackend)
+    assert sqlite.hot is None
+    sqlite.close()
+    assert (tmp_path / "chat_hub.db").exists()
+
+    hot = create_backend(Settings(storage_backend="sqlite", data_dir=str(tmp_path)))
+    assert isinstance(hot, SqliteBackend) and isinstance(hot.hot, HotTier)
+    hot.close()
@@ -0,0 +1,143 @@
+"""导出 / 导入测试。"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqliter import SqliterDB
+
+from src.database import open_database
+from src.storage import SqliteBackend
+from src.transfer import BulkImporter, export_ndjson, import_ndjson
+
+
+def _indexes(db: SqliterDB, *, unique: bool = False) -> set[str]:
+    """导入涉及的数据表上的二级索引（unique 为 True 时只取唯一索引）。"""
+    rows = db.connect().execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        "AND tbl_name IN ('messages', 'memories', 'session_configs')"
+    )
+    return {name for name, sql in rows if not unique or sql.startswith("CREATE UNIQUE INDEX")}
+
+
+def _history(db: SqliterDB, session_id: str) -> list[tuple[str, str]]:
+    return [(r.role, r.content) for r in SqliteBackend(db).message_history("b", session_id)]
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> SqliterDB:
+    db = open_database(str(tmp_path / "source.db"))
+    backend = SqliteBackend(db)
+    for session_id in ("s1", "s2"):
+        backend.add_message("b", session_id, "user", json.dumps("hi"))
+        # 同一秒内内容相同的两条消息都应保留
+        backend.add_message("b", session_id, "user", json.dumps("hi"))
+        backend.add_message("b", session_id, "assistant", json.dumps(f"reply {session_id}"))
+    backend.set_memory("b", "name", json.dumps("Alice"))
+    backend.set_config("b", "s1", "context_length", "20")
+    return db
+
+
+@pytest.fixture
+def target(tmp_path: Path) -> SqliterDB:
+    return open_database(str(tmp_path / "target.db"))
+
+
+def test_roundtrip(source: SqliterDB, target: SqliterDB) -> None:
+    counts = import_ndjson(target, export_ndjson(source, "b"))
+    assert counts == {"messages": 6, "memories": 1, "session_configs": 1}
+    assert _history(target, "s1") == _history(source, "s1")
+    assert SqliteBackend(target).session_stats("b", "s2") is not None
+
+
+def test_export_does_not_block_writers(source: SqliterDB) -> None:
+    conn = sqlite3.connect(source.db_filename)
+    lines = export_ndjson(conn, "b")
+    next(lines)  # 导出的读事务保持打开
+    SqliteBackend(source).add_message("b", "s1", "user", json.dumps("late"))
+    assert sum('"messages"' in line for line in lines) == 5
+    conn.close()
+    assert _history(source, "s1")[-1] == ("user", "late")
+
+
+def test_reimport_is_idempotent(source: SqliterDB, target: SqliterDB) -> None:
+    lines = list(export_ndjson(source, "b"))
+    import_ndjson(target, lines)
+
+    with BulkImporter(target) as importer:
+        for line in lines:
+            importer.add_line(line)
+    assert importer.counts["messages"] == 0
+    assert importer.skipped == 6
+    assert _history(target, "s1") == _history(source, "s1")
+    assert SqliteBackend(target).session_stats("b", "s1").message_count == 3  # type: ignore[union-attr]
+
+
+def test_rerun_after_partial_failure_completes_import(source: SqliterDB, target: SqliterDB) -> None:
+    lines = [line for line in export_ndjson(source, "b") if '"messages"' in line]
+    with pytest.raises(ValueError), BulkImporter(target, batch_size=2) as importer:
+        for line in lines[:4]:
+            importer.add_line(line)
+        importer.add_line('{"table": "unknown", "row": {}}')
+    assert importer.counts["messages"] == 4
+
+    import_ndjson(target, lines)
+    assert _history(target, "s1") == _history(source, "s1")
+    assert _history(target, "s2") == _history(source, "s2")
+
+
+def test_indexes_kept_unless_dropped(source: SqliterDB, target: SqliterDB) -> None:
+    indexes = _indexes(target)
+    assert indexes
+
+    with BulkImporter(target) as importer:
+        assert _indexes(target) == indexes
+        for line in export_ndjson(source, "b"):
+            importer.add_line(line)
+
+    with BulkImporter(target, drop_indexes=True):
+        # 唯一索引用于导入去重，不会被删除
+        assert _indexes(target) == _indexes(target, unique=True) != set()
+    assert _indexes(target) == indexes
+
+
+def test_legacy_rows_without_uid_are_deduplicated(target: SqliterDB) -> None:
+    row = {"bot_id": "b", "session_id": "s", "role": "user", "content": "[]", "created_at": 1700000000}
+    lines = [json.dumps({"table": "messages", "row": row})]
+    assert import_ndjson(target, lines)["messages"] == 1
+    assert import_ndjson(target, lines)["messages"] == 0
+    assert len(_history(target, "s")) == 1
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        '{"table": "messages", "row": []}',
+        '{"table": "messages", "row": {"bot_id": "b", "session_id": "s", "role": "user", "content": 1}}',
+        '{"table": "messages", "row": {"bot_id": "b", "session_id": "s", "role": "user"}}',
+    ],
+)
+def test_invalid_rows_are_rejected(target: SqliterDB, line: str) -> None:
+    with pytest.raises(ValueError), BulkImporter(target) as importer:
+        importer.add_line(line)
+
+
+def test_upgrade_assigns_uids(tmp_path: Path) -> None:
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE messages (pk INTEGER PRIMARY KEY AUTOINCREMENT, created_at INTEGER, updated_at INTEGER, "
+        "bot_id TEXT, session_id TEXT, role TEXT, content TEXT);"
+        "INSERT INTO messages (created_at, updated_at, bot_id, session_id, role, content) "
+        "VALUES (1, 1, 'b', 's', 'user', '[]'), (1, 1, 'b', 's', 'user', '[]');"
+        "PRAGMA user_version = 2;"
+    )
+    conn.close()
+
+    db = open_database(path)
+    uids = [uid for (uid,) in db.connect().execute("SELECT uid FROM messages")]
+    assert len(set(uids)) == 2 and None not in uids
+    assert SqliteBackend(db).session_stats("b", "s").message_count == 2  # type: ignore[union-attr]